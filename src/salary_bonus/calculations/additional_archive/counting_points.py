@@ -1,83 +1,112 @@
+import numpy as np
 import pandas as pd
 
 from src.salary_bonus.calculations.additional_archive.utils import (
     check_add_filled_projects,
 )
-from src.salary_bonus.calculations.project_archive.counting_points import check_spend_time
-from src.salary_bonus.config.defaults import ADD_WORK_TYPES
-
-
-def count_add_points(row: pd.Series, df: pd.DataFrame) -> int | str:
-    """
-    Считает и возвращает сумму полученных баллов.
-    Если подсчет произвести невозможно, то возвращает
-    строку-предупреждение об этом.
-    """
-    points = 0
-    filled_project = check_add_filled_projects(row)
-    if not filled_project:
-        return "Необходимо заполнить данные для расчёта"
-
-    work_types = row["Тип работы"].split(", ")
-
-    for w_type in work_types:
-        if w_type not in ADD_WORK_TYPES:
-            return "Неизвестный тип работы, невозможно сделать рассчёт"
-
-    if "Расстановка оборудования" in work_types:
-        points += 0.2
-    if "Подготовка спецификации" in work_types:
-        points += 0.2
-    if "ГР Модульная установка" in work_types:
-        points += check_gr(row)
-    if "ГР Модульная установка 500+" in work_types:
-        points += check_gr(row)
-        points += 1.5
-    if "ГР Централизованная установка" in work_types:
-        points += check_gr_center(row)
-
-    points = check_spend_time(row, points, df, amount=0, archive_sh=False)
-
-    if isinstance(points, str):
-        return points
-
-    return round(points, 1)
+from src.salary_bonus.calculations.ingest import UNKNOWN_WORK_TYPE
+from src.salary_bonus.calculations.project_archive.counting_points import (
+    DEADLINE_COEFFICIENT,
+    NOT_FILLED,
+    NOT_SUBMITTED,
+    UNKNOWN_WORK,
+    check_deadlines,
+    round_points,
+)
 
 
-def check_gr(row: pd.Series) -> int | float:
+def check_gr(df: pd.DataFrame) -> np.ndarray:
     """
     Начисление баллов за количество направлений при ГР.
 
     Args:
-        row (pd.Series): строка с данными проекта
+        df (pd.DataFrame): типизированные данные доп. работ
     """
-    try:
-        amount_directions = int(row["Количество направлений"])
-    except ValueError:
-        amount_directions = 0
-
-    if amount_directions > 20:
-        return 1
-    elif 20 >= amount_directions > 10:
-        return 0.5
-    elif amount_directions < 11:
-        return 0.2
+    amount_directions = df["Количество направлений"].fillna(0).to_numpy()
+    return np.select([amount_directions > 20, amount_directions > 10], [1, 0.5], 0.2)
 
 
-def check_gr_center(row: pd.Series) -> float | int:
+def check_gr_center(df: pd.DataFrame) -> np.ndarray:
     """
     Начисление баллов за количество направлений при ГР
     централизованной установки.
 
     Args:
-        row (pd.Series): строка с данными проекта
+        df (pd.DataFrame): типизированные данные доп. работ
+    """
+    amount_directions = df["Количество направлений"].fillna(0).to_numpy()
+    return np.where(amount_directions <= 15, 1.5, 2)
+
+
+def count_add_base_points(df: pd.DataFrame) -> pd.Series:
+    """Считает баллы за доп. работы без учета дедлайна."""
+    gr = check_gr(df)
+    terms = [
+        ("Расстановка оборудования", 0.2),
+        ("Подготовка спецификации", 0.2),
+        ("ГР Модульная установка", gr),
+        ("ГР Модульная установка 500+", gr),
+        ("ГР Модульная установка 500+", 1.5),
+        ("ГР Централизованная установка", check_gr_center(df)),
+    ]
+
+    points = np.zeros(len(df))
+    for work_type, term in terms:
+        points = points + np.where(df[work_type], term, 0)
+    return pd.Series(points, index=df.index)
+
+
+def count_add_points(
+    df: pd.DataFrame, errors: pd.DataFrame, by: str | None = None
+) -> pd.DataFrame:
+    """
+    Считает баллы за доп. работы сразу для всей таблицы.
+    Если подсчет произвести невозможно, баллы - NaN,
+    а причина записывается в статус баллов.
+
+    Args:
+        df (pd.DataFrame): типизированные данные доп. работ (parse_additional_work)
+        errors (pd.DataFrame): маска ошибок разбора данных доп. работ
+        by (str | None): столбец с проектировщиком, если таблица содержит
+            доп. работы нескольких проектировщиков: дедлайны проставляются
+            по доп. работам каждого проектировщика
+
+    Returns:
+        pd.DataFrame с индексом df и столбцами "Баллы", "Статус баллов",
+        "Дедлайн" и "Дедлайн просрочен"
+        (см. project_archive.counting_points.count_points).
     """
-    try:
-        amount_directions = int(row["Количество направлений"])
-    except ValueError:
-        amount_directions = 0
-
-    if amount_directions <= 15:
-        return 1.5
-    else:
-        return 2
+    filled = check_add_filled_projects(df, errors)
+    unknown = filled & df[UNKNOWN_WORK_TYPE]
+    evaluated = filled & ~unknown
+
+    base_points = count_add_base_points(df)
+    deadlines = check_deadlines(
+        df,
+        errors,
+        base_points * 5,
+        evaluated,
+        key_column="Наименование объекта",
+        by=by,
+    )
+    points = base_points.mask(deadlines["Просрочен"], base_points * DEADLINE_COEFFICIENT)
+
+    status = deadlines["Статус"]
+    scored = evaluated & status.isna()
+    preliminary = status == NOT_SUBMITTED
+
+    result = pd.Series(np.nan, index=df.index)
+    result[scored] = round_points(points[scored])
+    result[preliminary] = base_points[preliminary]
+
+    status[~filled] = NOT_FILLED
+    status[unknown] = UNKNOWN_WORK
+
+    return pd.DataFrame(
+        {
+            "Баллы": result,
+            "Статус баллов": status,
+            "Дедлайн": deadlines["Дедлайн"],
+            "Дедлайн просрочен": deadlines["Дедлайн просрочен"],
+        }
+    )
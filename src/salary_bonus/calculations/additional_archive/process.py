@@ -1,22 +1,37 @@
-import time
-
 import aiogram
 import pandas as pd
 
 from src.salary_bonus.calculations.additional_archive.counting_points import (
     count_add_points,
 )
+from src.salary_bonus.calculations.ingest import parse_additional_work
 from src.salary_bonus.calculations.mounth_points import (
     calculate_by_month,
     empty_months_df,
+    split_by,
+)
+from src.salary_bonus.calculations.partition import (
+    assigned_rows,
+    partition_by_engineer,
+    rows_by_engineer,
 )
-from src.salary_bonus.config.defaults import ADDITIONAL_WORK, AFTER_ENG_SLEEP
+from src.salary_bonus.config.defaults import ADDITIONAL_WORK
 from src.salary_bonus.logger import logging
-from src.salary_bonus.utils import get_add_work_data
+from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
 from src.salary_bonus.worksheets.worksheets import send_add_work_data_to_spreadsheet
 
 
+def send_engineer_add_work(
+    engineer: str,
+    add_work: dict[str, pd.DataFrame],
+    eng_main_arch_data: dict[str, pd.DataFrame],
+) -> None:
+    """Добавляет доп. работы проектировщика в план записи его листа."""
+    send_add_work_data_to_spreadsheet(add_work[engineer], engineer, eng_main_arch_data)
+
+
 async def process_additional_work_data(
+    add_work_data_df: pd.DataFrame | None,
     engineers: list[str],
     tg_bot: aiogram.Bot,
     eng_main_arch_data: dict[str, pd.DataFrame],
@@ -26,6 +41,7 @@ async def process_additional_work_data(
     и производит расчет баллов по ним для проектировщиков.
 
     Args:
+        add_work_data_df (pd.DataFrame | None): данные из архива доп. работ
         engineers (list[str]): Список проектировщиков, для которых
             необходимо произвести расчет баллов.
         tg_bot (aiogram.Bot): Экземпляр бота для отправки уведомлений.
@@ -40,8 +56,6 @@ async def process_additional_work_data(
     """
     results = {}
 
-    add_work_data_df: pd.DataFrame = get_add_work_data()
-
     if add_work_data_df is None:
         await tg_bot.send_message(
             f'Ошибка: таблица "{ADDITIONAL_WORK}" не найдена.\n'
@@ -54,34 +68,45 @@ async def process_additional_work_data(
         )
         return results
 
-    for engineer in engineers:
-        logging.info(
-            f"Начинается расчет баллов за доп. работы для проектировщика {engineer}."
-        )
+    engineer_rows = partition_by_engineer(add_work_data_df, engineers)
+
+    # каждая доп. работа разбирается один раз, а баллы считаются
+    # сразу для всех пар проектировщик - доп. работа: дедлайны
+    # проставляются по доп. работам каждого проектировщика
+    add_work = add_work_data_df.loc[assigned_rows(add_work_data_df, engineer_rows)]
+    typed, errors = parse_additional_work(add_work)
+    add_work = rows_by_engineer(add_work, engineer_rows).reset_index(drop=True)
+    typed = rows_by_engineer(typed, engineer_rows).reset_index(drop=True)
+    errors = rows_by_engineer(errors, engineer_rows).reset_index(drop=True)
+    points = count_add_points(typed, errors, by="Проектировщик")
+    add_work[points.columns] = points
+
+    scored = typed[points["Статус баллов"].isna()].assign(Баллы=points["Баллы"])
+    monthly = split_by(
+        calculate_by_month(scored, column="Баллы", by="Проектировщик"),
+        by="Проектировщик",
+    )
+    scored_engineers = set(scored["Проектировщик"])
 
-        engineer_projects = add_work_data_df.loc[
-            add_work_data_df["Разработал"].str.contains(f"{engineer}")
-        ].reset_index(drop=True)
+    for engineer in engineers:
+        logging.info(f"Подготовка баллов за доп. работы для проектировщика {engineer}.")
 
-        if engineer_projects.empty:
+        if engineer not in engineer_rows:
             logging.info(f"Нет доп. проектов у проектировщика {engineer}.")
             continue
 
-        engineer_projects["Баллы"] = engineer_projects.apply(
-            count_add_points, axis=1, args=(engineer_projects,)
-        )
-
-        if not engineer_projects.empty:
-            months = calculate_by_month(engineer_projects, column="Баллы")
-            results[engineer] = months
+        if engineer in scored_engineers:
+            results[engineer] = monthly[engineer]
         else:
             results[engineer] = empty_months_df(column="Баллы")
-            logging.info(
-                f"Нет готовых доп. работ у проектировщика {engineer}. "
-                f"Переходим к следующему проектировщику через 10 секунд."
-            )
+            logging.info(f"Нет готовых доп. работ у проектировщика {engineer}.")
 
-        send_add_work_data_to_spreadsheet(engineer_projects, engineer, eng_main_arch_data)
-        time.sleep(AFTER_ENG_SLEEP)
+    # листы проектировщиков готовятся одновременно
+    await sheets_manager.run_for_each(
+        send_engineer_add_work,
+        [engineer for engineer in engineers if engineer in engineer_rows],
+        split_by(add_work, by="Проектировщик"),
+        eng_main_arch_data,
+    )
 
     return results
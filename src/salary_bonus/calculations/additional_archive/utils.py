@@ -1,13 +1,11 @@
 import pandas as pd
 
 
-def check_add_filled_projects(row: pd.Series) -> bool:
-    characteristics = [
-        "Наименование объекта",
-        "Тип работы",
-        "Дата начала проекта",
-    ]
-    for char in characteristics:
-        if row[f"{char}"] == "" or row[f"{char}"] is None:
-            return False
-    return True
+def check_add_filled_projects(df: pd.DataFrame, errors: pd.DataFrame) -> pd.Series:
+    """
+    Проверка на возможность подсчета баллов за доп. работы.
+    Если какие-то характеристики отсутствуют, подсчет невозможен.
+    """
+    characteristics = df[["Наименование объекта", "Тип работы"]]
+    no_start = df["Дата начала проекта"].isna() & ~errors["Дата начала проекта"]
+    return ~(characteristics.eq("") | characteristics.isna()).any(axis=1) & ~no_start
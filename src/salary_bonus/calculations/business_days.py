@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+import holidays
+import numpy as np
+import pandas as pd
+
+WEEKMASK = "1111100"
+
+# запас лет после последней даты начала: обычно все дедлайны попадают
+# в календарь с первого расчета, более поздние дедлайны пересчитываются
+YEARS_AHEAD = 2
+
+
+@lru_cache
+def business_calendar(first_year: int, last_year: int) -> np.busdaycalendar:
+    """
+    Календарь рабочих дней РФ за годы first_year..last_year:
+    пятидневка без государственных праздников.
+    Собирается один раз для каждого диапазона лет.
+    """
+    ru_holidays = holidays.RU(years=range(first_year, last_year + 1))
+    return np.busdaycalendar(
+        weekmask=WEEKMASK, holidays=np.array(sorted(ru_holidays), dtype="datetime64[D]")
+    )
+
+
+def _year(date: np.datetime64) -> int:
+    return int(date.astype("datetime64[Y]").astype(int)) + 1970
+
+
+def _offset_business_days(start: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Рабочий день номер days + 1, считая с даты start.
+    Если результат выходит за годы календаря, календарь расширяется
+    до года результата и расчет повторяется: праздники поздних лет
+    сдвигают дедлайны.
+    """
+    first_year = _year(start.min())
+    last_year = _year(start.max()) + YEARS_AHEAD
+    while True:
+        calendar = business_calendar(first_year, last_year)
+        offset = np.busday_offset(start, days, roll="forward", busdaycal=calendar)
+        if _year(offset.max()) <= last_year:
+            return offset
+        last_year = _year(offset.max())
+
+
+def calculate_deadlines(
+    start_dates: pd.Series, work_days: pd.Series, extensions: pd.Series | int = 0
+) -> pd.Series:
+    """
+    Считает дедлайны для столбца дат начала.
+
+    Дедлайн - рабочий день номер work_days, считая с даты начала
+    (если дата начала рабочий день, она первая), плюс дни продления.
+    Дробное количество рабочих дней округляется вверх, при нуле
+    дней дедлайн - день перед датой начала.
+    Строки без даты начала или количества дней получают NaT.
+
+    Args:
+        start_dates (pd.Series): даты начала (datetime64)
+        work_days (pd.Series): количество рабочих дней на проект
+        extensions (pd.Series | int): продление дедлайна в календарных днях
+    """
+    start = pd.to_datetime(start_dates).to_numpy(dtype="datetime64[D]")
+    days = np.ceil(pd.to_numeric(work_days, errors="coerce").to_numpy(dtype=float))
+    extension = np.broadcast_to(np.asarray(extensions, dtype="int64"), start.shape)
+
+    valid = ~np.isnat(start) & ~np.isnan(days)
+    deadlines = np.full(start.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+
+    if valid.any():
+        start, days, extension = start[valid], days[valid].astype(int), extension[valid]
+        positive = days > 0
+        deadline = start - np.timedelta64(1, "D")
+        if positive.any():
+            deadline[positive] = _offset_business_days(
+                start[positive], days[positive] - 1
+            )
+        deadlines[valid] = deadline + extension.astype("timedelta64[D]")
+
+    return pd.Series(deadlines.astype("datetime64[ns]"), index=start_dates.index)
+
+
+def count_non_working_days(start_dates: pd.Series, end_dates: pd.Series) -> pd.Series:
+    """
+    Считает количество выходных и праздничных дней между датами
+    (обе даты включительно) для столбцов дат.
+    """
+    start = pd.to_datetime(start_dates).to_numpy(dtype="datetime64[D]")
+    end = pd.to_datetime(end_dates).to_numpy(dtype="datetime64[D]")
+    start, end = np.minimum(start, end), np.maximum(start, end)
+
+    valid = ~np.isnat(start) & ~np.isnat(end)
+    result = np.full(start.shape, np.nan)
+
+    if valid.any():
+        start, end = start[valid], end[valid]
+        calendar = business_calendar(_year(start.min()), _year(end.max()))
+        end = end + np.timedelta64(1, "D")
+        working = np.busday_count(start, end, busdaycal=calendar)
+        result[valid] = (end - start).astype(int) - working
+
+    return pd.Series(result, index=start_dates.index)
@@ -0,0 +1,213 @@
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+from pandas.core.series import Series
+
+from src.salary_bonus.config.defaults import ADD_WORK_TYPES
+
+DATE_FORMAT = "%d.%m.%Y"
+
+DATES = ["Дата начала проекта", "Дата окончания проекта"]
+PROJECT_INTEGERS = [
+    "Количество направлений",
+    "СОТ (количество камер)",
+    "СКУД (количество точек доступа)",
+    "Продление дедлайна",
+]
+ADD_WORK_INTEGERS = ["Количество направлений", "Продление дедлайна"]
+SECTIONS = ["ПС", "ОС", "СОУЭ", "Автоматизация систем вентиляции"]
+PROJECT_FLAGS = {
+    **{section: "Есть" for section in SECTIONS},
+    "Сети": "Есть",
+    "Объект культурного наследия": "Да",
+}
+PROJECT_CATEGORIES = ["Страна", "Тип объекта"]
+UNKNOWN_WORK_TYPE = "Неизвестный тип работы"
+
+
+def _is_empty(values: Series) -> Series:
+    return values.isna() | (values == "")
+
+
+def _parse_unique(values: Series, parse: Callable[[str], float]) -> Series:
+    """
+    Разбирает столбец функцией parse. Каждое уникальное значение
+    разбирается один раз, нераспознанные значения - NaN.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    parsed = np.array([parse(value) for value in uniques], dtype=float)
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def _int_or_nan(value: str) -> float:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _square_or_nan(square: str) -> float:
+    """
+    Площадь: число, первое число из перечисления через запятую
+    или 1.0, если площадь не указана числом.
+    """
+    try:
+        return float(square)
+    except (TypeError, ValueError):
+        pass
+    if "," not in square:
+        return 1.0
+    try:
+        return float(square.split(",")[0])
+    except ValueError:
+        return np.nan
+
+
+def _modules_or_nan(modules: str) -> float:
+    """Количество модулей: число или сумма чисел через перенос строки или "+"."""
+    try:
+        modules = modules.strip()
+        return int(modules)
+    except (AttributeError, ValueError):
+        pass
+    for sep in ("\n", "+"):
+        if sep in modules:
+            try:
+                return sum(int(part.strip()) for part in modules.split(sep))
+            except ValueError:
+                return np.nan
+    return np.nan
+
+
+def _decimal_or_nan(amount: str) -> float:
+    """Сумма в рублях: пробелы-разделители разрядов и десятичная запятая."""
+    try:
+        return float(amount.replace("\xa0", "").replace(",", "."))
+    except (AttributeError, ValueError):
+        return np.nan
+
+
+def parse_dates(values: Series) -> Series:
+    """Переводит даты вида дд.мм.гггг в datetime64, нераспознанные даты - NaT."""
+    return pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+
+
+def parse_integers(values: Series) -> Series:
+    """Целые числа по правилам int(), нераспознанные значения - NaN."""
+    return _parse_unique(values, _int_or_nan)
+
+
+def parse_square(values: Series) -> Series:
+    return _parse_unique(values, _square_or_nan)
+
+
+def parse_modules(values: Series) -> Series:
+    return _parse_unique(values, _modules_or_nan)
+
+
+def parse_decimals(values: Series) -> Series:
+    return _parse_unique(values, _decimal_or_nan)
+
+
+def count_authors(authors: Series) -> Series:
+    """Количество проектировщиков, разрабатывающих проект."""
+    return authors.astype("string").str.count(",").fillna(0).astype(int) + 1
+
+
+def _parse_columns(
+    df: DataFrame, parsers: dict[str, Callable[[Series], Series]]
+) -> tuple[DataFrame, DataFrame]:
+    """
+    Разбирает столбцы парсерами. Ошибка разбора - непустая ячейка,
+    которую не удалось перевести в значение.
+    """
+    typed = df.copy()
+    errors = DataFrame(False, index=df.index, columns=df.columns)
+
+    for column, parse in parsers.items():
+        typed[column] = parse(df[column])
+        errors[column] = typed[column].isna() & ~_is_empty(df[column])
+
+    return typed, errors
+
+
+def parse_project_archive(df: DataFrame) -> tuple[DataFrame, DataFrame]:
+    """
+    Переводит строковые данные архива проектов в типизированные столбцы:
+        - даты: datetime64 (NaT, если даты нет или она некорректна);
+        - количества: float (NaN, если значение не указано числом);
+        - площадь и количество модулей: float по правилам разбора
+          значений вида "100, 200" и "10+5";
+        - "Есть"/"Да": bool;
+        - "Является корректировкой": bool;
+        - "Страна", "Тип объекта": category ("Тип объекта" в нижнем регистре);
+        - "Количество авторов": int.
+    Остальные столбцы остаются строками.
+
+    Returns:
+        tuple[DataFrame, DataFrame]: типизированный DataFrame и маска
+        ошибок разбора с тем же индексом и столбцами (True - ячейка
+        заполнена, но не распознана).
+    """
+    parsers: dict[str, Callable[[Series], Series]] = {
+        column: parse_dates for column in DATES
+    }
+    parsers.update({column: parse_integers for column in PROJECT_INTEGERS})
+    parsers["Площадь защищаемых помещений (м^2)"] = parse_square
+    parsers["Количество модулей"] = parse_modules
+    if "Сумма заложенного оборудования" in df.columns:
+        parsers["Сумма заложенного оборудования"] = parse_decimals
+
+    typed, errors = _parse_columns(df, parsers)
+
+    for column, value in PROJECT_FLAGS.items():
+        typed[column] = df[column] == value
+    typed["Является корректировкой"] = (
+        df["Является корректировкой"]
+        .astype("string")
+        .str.lower()
+        .str.contains("да", regex=False)
+        .fillna(False)
+        .astype(bool)
+    )
+    typed["Тип объекта"] = df["Тип объекта"].astype("string").str.strip().str.lower()
+    for column in PROJECT_CATEGORIES:
+        typed[column] = typed[column].astype("category")
+    typed["Количество авторов"] = count_authors(df["Разработал"])
+
+    return typed, errors
+
+
+def parse_additional_work(df: DataFrame) -> tuple[DataFrame, DataFrame]:
+    """
+    Переводит строковые данные архива доп. работ в типизированные столбцы:
+        - даты: datetime64;
+        - "Количество направлений", "Продление дедлайна": float;
+        - "Тип работы": по столбцу bool на каждый тип из ADD_WORK_TYPES
+          и столбец "Неизвестный тип работы".
+
+    Returns:
+        tuple[DataFrame, DataFrame]: типизированный DataFrame и маска
+        ошибок разбора.
+    """
+    parsers: dict[str, Callable[[Series], Series]] = {
+        column: parse_dates for column in DATES
+    }
+    parsers.update({column: parse_integers for column in ADD_WORK_INTEGERS})
+    typed, errors = _parse_columns(df, parsers)
+
+    work_types = (
+        df["Тип работы"]
+        .astype("string")
+        .fillna("")
+        .str.split(", ", regex=False)
+        .explode()
+    )
+    for work_type in ADD_WORK_TYPES:
+        typed[work_type] = (work_types == work_type).groupby(level=0).any()
+    typed[UNKNOWN_WORK_TYPE] = (~work_types.isin(ADD_WORK_TYPES)).groupby(level=0).any()
+    errors["Тип работы"] = typed[UNKNOWN_WORK_TYPE] & ~_is_empty(df["Тип работы"])
+
+    return typed, errors
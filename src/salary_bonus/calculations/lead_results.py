@@ -4,121 +4,119 @@ from src.salary_bonus.logger import logging
 from src.salary_bonus.worksheets.worksheets import send_lead_res_to_ws
 
 
-def collect_gip_from_eng_points(eng_points: dict[str, pd.DataFrame]) -> pd.DataFrame:
-    """Сбор итоговой таблицы для ГИП из данных по инженерам."""
-
-    all_months: set[str] = set()
-    for df in eng_points.values():
-        if df is not None and not df.empty:
-            all_months.update(df["Месяц"].unique())
-
-    all_months = sorted(
-        all_months, key=lambda x: (int(x.split("-")[1]), int(x.split("-")[0]))
-    )
+def points_frame(eng_points: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Собирает баллы проектировщиков в одну таблицу
+    со столбцами "Имя", "Месяц", "Баллы".
+    """
+    frames = {
+        engineer: df[["Месяц", "Баллы"]]
+        for engineer, df in eng_points.items()
+        if df is not None and not df.empty
+    }
+    if not frames:
+        return pd.DataFrame(columns=["Имя", "Месяц", "Баллы"])
 
-    total_row = {m: 0.0 for m in all_months}
+    points = pd.concat(frames, names=["Имя", None]).reset_index(level="Имя")
+    points["Баллы"] = points["Баллы"].astype(float)
+    return points.reset_index(drop=True)
 
-    for df in eng_points.values():
-        if df is None or df.empty:
-            continue
-        for _, r in df.iterrows():
-            total_row[r["Месяц"]] += float(r["Баллы"])
 
-    total_row["Итого"] = float(sum(total_row.values()))
-    return pd.DataFrame([total_row], index=["Всего"])
+def sort_months(months) -> list[str]:
+    """Сортирует месяцы вида MM-YYYY по году и месяцу."""
+    return sorted(months, key=lambda x: (int(x.split("-")[1]), int(x.split("-")[0])))
 
 
-def collect_gip_df(
-    lead_results: dict[str, pd.DataFrame], eng_points: dict[str, pd.DataFrame]
+def employees_hierarchy(
+    leads: dict[str, list[str]], engineers: list[str]
 ) -> pd.DataFrame:
     """
-    Итоговая таблица для ГИП: одна строка 'Всего' по месяцам + 'Итого'.
+    Иерархия сотрудников: строка на каждую пару проектировщик - руководитель,
+    проектировщики без руководителя - с пустым "Руководитель".
 
-    - Если lead_results не пустой: суммируем строки 'Всего' по каждому лиду.
-    - Если lead_results пустой: считаем из eng_points (по gip_engineers, если задан).
+    Столбец "ГИП" - "Всего" для строк, которые входят в итог ГИП'а:
+    строки с руководителем, а если руководителей нет - все проектировщики.
+    Более высокие уровни (например, начальники отделов) добавляются
+    такими же столбцами и сворачиваются функцией rollup.
     """
-    # 1) Если есть результаты лидов - считаем из них
-    if lead_results:
-        # Берём полный список колонок (месяцы + Итого) из объединения
-        all_cols: list[str] = []
-        seen = set()
-        for df in lead_results.values():
-            for c in df.columns.tolist():
-                if c not in seen:
-                    seen.add(c)
-                    all_cols.append(c)
-
-        total = pd.Series(0.0, index=all_cols)
-
-        for df in lead_results.values():
-            if "Всего" in df.index:
-                total = total.add(df.loc["Всего", all_cols].astype(float), fill_value=0.0)
-            else:
-                total = total.add(
-                    df.sum(axis=0).reindex(all_cols).astype(float), fill_value=0.0
-                )
-
-        gip_df = pd.DataFrame([total], index=["Всего"])
-        return gip_df
-
-    # 2) Если лидов нет - считаем напрямую из eng_points по всем инженерам
-    return collect_gip_from_eng_points(eng_points)
-
-
-def collect_lead_results(
-    eng_points: dict[str, pd.DataFrame], leads: dict[str, list[str]]
-) -> dict[str, pd.DataFrame]:
-    """Собирает результаты по руководителям группы."""
-    result: dict[str, pd.DataFrame] = {}
+    hierarchy = pd.DataFrame(
+        [(engineer, lead) for lead, names in leads.items() for engineer in names],
+        columns=["Имя", "Руководитель"],
+    )
+    without_lead = [name for name in engineers if name not in set(hierarchy["Имя"])]
+    hierarchy = pd.concat(
+        [hierarchy, pd.DataFrame({"Имя": without_lead})], ignore_index=True
+    )
 
-    # все месяцы, которые встречаются в данных
-    all_months: set[str] = set()
-    for df in eng_points.values():
-        all_months.update(df["Месяц"].unique())
+    in_gip = hierarchy["Руководитель"].notna() if leads else hierarchy["Имя"].notna()
+    hierarchy["ГИП"] = pd.Series("Всего", index=hierarchy.index).where(in_gip)
+    return hierarchy
 
-    # сортировка MM-YYYY
-    all_months = sorted(all_months, key=lambda x: (x.split("-")[1], x.split("-")[0]))
 
-    for lead_name, engineers in leads.items():
-        rows = []
+def points_table(points: pd.DataFrame, hierarchy: pd.DataFrame) -> pd.DataFrame:
+    """
+    Баллы по месяцам для каждой строки иерархии.
+    Индекс - уровни иерархии, столбцы - месяцы по порядку и "Итого".
+    """
+    months = sort_months(points["Месяц"].unique())
+    by_month = points.pivot_table(
+        index="Имя", columns="Месяц", values="Баллы", aggfunc="sum", fill_value=0.0
+    ).reindex(columns=months, fill_value=0.0)
 
-        for engineer in engineers:
-            row = {month: 0.0 for month in all_months}
-            row["Имя"] = engineer
+    table = hierarchy.join(by_month, on="Имя").set_index(hierarchy.columns.tolist())
+    table = table.fillna(0.0).astype(float)
+    table["Итого"] = table.sum(axis=1)
+    return table
 
-            df = eng_points.get(engineer)
-            if df is not None:
-                for _, eng_row in df.iterrows():
-                    row[eng_row["Месяц"]] += float(eng_row["Баллы"])
 
-            rows.append(row)
+def rollup(table: pd.DataFrame, level: str) -> pd.DataFrame:
+    """
+    Суммирует баллы строк иерархии по значениям уровня level
+    (руководитель, ГИП и т.д.). Строки без значения уровня не учитываются.
+    """
+    return table.groupby(level=level, sort=False).sum()
 
-        lead_df = pd.DataFrame(rows).set_index("Имя")
 
-        # итог по строке (сумма по месяцам)
-        lead_df["Итого"] = lead_df.sum(axis=1)
+def collect_lead_results(table: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Собирает результаты по руководителям группы: строки проектировщиков
+    и строка "Всего" для каждого руководителя.
+    """
+    totals = rollup(table, "Руководитель")
 
-        # итог по столбцу
-        total_row = lead_df.sum(axis=0)
-        lead_df.loc["Всего"] = total_row
+    return {
+        lead: pd.concat(
+            [
+                group.set_axis(group.index.get_level_values("Имя")),
+                totals.loc[[lead]].set_axis(["Всего"]),
+            ]
+        )
+        for lead, group in table.groupby(level="Руководитель", sort=False)
+    }
 
-        result[lead_name] = lead_df
 
-    return result
+def collect_gip_df(table: pd.DataFrame) -> pd.DataFrame:
+    """Итоговая таблица для ГИП: одна строка 'Всего' по месяцам + 'Итого'."""
+    gip_df = rollup(table, "ГИП").reindex(["Всего"], fill_value=0.0)
+    gip_df.index.name = None
+    return gip_df
 
 
 def process_lead_data(
     eng_points: dict[str, pd.DataFrame], leads: dict[str, list[str]], gip: list[str]
 ):
     """Обрабатывает и отправляет данные по руководителям группы и гип."""
+    hierarchy = employees_hierarchy(leads, list(eng_points))
+    table = points_table(points_frame(eng_points), hierarchy)
+
     if len(leads) > 0:
-        lead_results = collect_lead_results(eng_points, leads)
+        lead_results = collect_lead_results(table)
     else:
         lead_results = {}
         logging.warning("Для расчета баллов руководителей не найдено данных.")
 
     if len(gip) > 0:
-        gip_results = collect_gip_df(lead_results, eng_points)
+        gip_results = collect_gip_df(table)
     else:
         gip_results = None
         logging.warning("Для расчета баллов ГИП'а не найдено данных.")
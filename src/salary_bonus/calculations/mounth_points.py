@@ -1,78 +1,47 @@
-from typing import Any, Dict
-
 import pandas as pd
-from pandas import DataFrame, Series
+from pandas import DataFrame
 
 from src.salary_bonus.config.defaults import CURRENT_YEAR
 from src.salary_bonus.logger import logging
 
 
-def calculate_month_points(row: Series, column: str) -> Dict[str, Any] | None:
-    """
-    Формирует запись для последующей агрегации значений по месяцам.
-
-    Args:
-      row: Одна строка исходного DataFrame (pandas.Series)
-            Ожидаемая структура строки DataFrame (`row`):
-                - "Дата окончания проекта": str | datetime
-                    Дата завершения проекта в формате "ДД.ММ.ГГГГ"
-                - column (str): int | float
-                    Колонка с числовым значением,
-                    название которой передаётся аргументом `column`
-      column: Название столбца DataFrame, содержащего числовое значение
-
-    Returns:
-      Словарь вида:
-        {
-            "Месяц": pandas.Period("YYYY-MM", freq="M"),
-            <column>: int | float
-        } или None, если дата некорректна
-    """
-    end_date = pd.to_datetime(
-        row["Дата окончания проекта"], dayfirst=True, format="%d.%m.%Y", errors="coerce"
-    )
-
-    if pd.isna(end_date):
-        return None
-
-    month_period = end_date.to_period("M")
-
-    return {
-        "Месяц": month_period,
-        column: row[column],
-    }
+def year_months() -> pd.PeriodIndex:
+    """Месяцы текущего года."""
+    return pd.period_range(start=f"{CURRENT_YEAR}-01", end=f"{CURRENT_YEAR}-12", freq="M")
 
 
 def empty_months_df(column: str) -> pd.DataFrame:
-    months = pd.period_range(
-        start=f"{CURRENT_YEAR}-01", end=f"{CURRENT_YEAR}-12", freq="M"
-    )
-    return pd.DataFrame(
-        {"Месяц": [f"{m.month:02d}-{m.year}" for m in months], column: [0.0] * 12}
-    )
+    months = year_months()
+    return pd.DataFrame({"Месяц": months.strftime("%m-%Y"), column: [0.0] * 12})
 
 
-def calculate_by_month(df: DataFrame, column: str) -> DataFrame:
+def calculate_by_month(df: DataFrame, column: str, by: str | None = None) -> DataFrame:
     """
     Агрегирует числовые значения указанного столбца по месяцам окончания проектов.
 
     Ожидаемая структура входного DataFrame (`df`):
-        - "Дата окончания проекта": str | datetime
+        - "Дата окончания проекта": datetime64 (parse_project_archive,
+          parse_additional_work)
         - column (str): int | float
             Столбец, имя которого передаётся аргументом `column`
             и содержит значения для агрегации
+        - by (str), если передан: ключ группы, например проектировщик
 
     Логика:
         - Каждый проект учитывается ровно один раз
         - Значение из столбца `column` полностью относится
           к месяцу завершения проекта
-        - Значения суммируются по месяцам
+        - Значения суммируются по месяцам (и по ключу `by`)
         - В результат включаются только месяцы текущего года
 
     :param df: Исходный DataFrame с данными по проектам
     :param column: Название столбца DataFrame, который необходимо агрегировать
+    :param by: Название столбца с ключом группы. Если передан, таблица
+        по месяцам строится для каждой группы за один вызов. Для столбца
+        category в результат попадают все категории
     :return: DataFrame с агрегированными значениями по месяцам
     Структура итогового DataFrame:
+        - by (str): ключ группы, если передан
         - "Месяц": str
             Месяц в формате "MM-YYYY"
         - column (str): float
@@ -83,33 +52,37 @@ def calculate_by_month(df: DataFrame, column: str) -> DataFrame:
         column,
     )
 
-    monthly_points = df.apply(
-        calculate_month_points,
-        axis=1,
-        args=(column,),
-    )
-    monthly_points = [item for item in monthly_points if item is not None]
+    month = df["Дата окончания проекта"].dt.to_period("M").rename("Месяц")
+    months = year_months()
 
-    if not monthly_points:
-        # Формируем пустую таблицу с нулями на все месяцы текущего года
-        return empty_months_df(column)
+    if by is None:
+        sums = df[column].groupby(month).sum().reindex(months, fill_value=0.0)
+        return DataFrame(
+            {"Месяц": months.strftime("%m-%Y"), column: sums.to_numpy(dtype=float)}
+        )
 
-    monthly_df = pd.DataFrame(monthly_points)
+    keys = df[by]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        groups = keys.cat.categories
+    else:
+        groups = pd.Index(keys.unique())
 
-    result = monthly_df.groupby("Месяц", as_index=False)[column].sum()
+    index = pd.MultiIndex.from_product([groups, months], names=[by, "Месяц"])
+    sums = df[column].groupby([keys, month], observed=True).sum()
+    sums = sums.reindex(index, fill_value=0.0)
 
-    result["Месяц"] = result["Месяц"].apply(
-        lambda period: f"{period.month:02d}-{period.year}"
-    )
-
-    # Создаем полный ряд месяцев текущего года
-    months = pd.period_range(
-        start=f"{CURRENT_YEAR}-01", end=f"{CURRENT_YEAR}-12", freq="M"
+    return DataFrame(
+        {
+            by: index.get_level_values(by),
+            "Месяц": index.get_level_values("Месяц").strftime("%m-%Y"),
+            column: sums.to_numpy(dtype=float),
+        }
     )
-    full_df = pd.DataFrame({"Месяц": [f"{m.month:02d}-{m.year}" for m in months]})
 
-    # Объединяем и заполняем пропуски нулями
-    final_df = full_df.merge(result, on="Месяц", how="left").fillna(0)
-    final_df[column] = final_df[column].astype(float)
 
-    return final_df
+def split_by(months: DataFrame, by: str) -> dict[str, DataFrame]:
+    """Разбивает результат calculate_by_month(..., by=by) на таблицы групп."""
+    return {
+        key: group.drop(columns=by).reset_index(drop=True)
+        for key, group in months.groupby(by, observed=True, sort=False)
+    }
@@ -0,0 +1,62 @@
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+from src.salary_bonus.calculations.utils import match_engineer_names
+from src.salary_bonus.logger import logging
+
+
+def split_authors(authors: pd.Series) -> pd.Series:
+    """
+    Разбивает столбец "Разработал" на отдельных авторов.
+    Возвращает Series, где каждая строка архива повторена
+    по разу на каждого автора.
+    """
+    return authors.astype("string").str.split(",").explode()
+
+
+def partition_by_engineer(df: DataFrame, engineers: list[str]) -> dict[str, pd.Index]:
+    """
+    Разбивает архив по проектировщикам за один проход по столбцу "Разработал".
+
+    Returns:
+        dict[str, pd.Index]: проектировщик -> метки строк архива с его
+        проектами в исходном порядке. Проектировщиков без проектов
+        в словаре нет.
+    """
+    logging.info("Распределение проектов архива по проектировщикам.")
+    authors = split_authors(df["Разработал"])
+    matches = match_engineer_names(authors, engineers)
+
+    pairs = pd.DataFrame({"row": matches.index, "engineer": matches.to_numpy()})
+    pairs = pairs.drop_duplicates()
+
+    return {
+        engineer: pd.Index(group["row"].to_numpy())
+        for engineer, group in pairs.groupby("engineer", sort=False)
+    }
+
+
+def assigned_rows(df: DataFrame, engineer_rows: dict[str, pd.Index]) -> pd.Index:
+    """
+    Метки строк архива, у которых есть хотя бы один проектировщик
+    из расчета, в исходном порядке.
+    """
+    rows = [label for labels in engineer_rows.values() for label in labels]
+    return df.index[df.index.isin(rows)]
+
+
+def rows_by_engineer(
+    df: DataFrame, engineer_rows: dict[str, pd.Index], column: str = "Проектировщик"
+) -> DataFrame:
+    """
+    Строки архива, повторенные для каждого их проектировщика,
+    со столбцом column (category) - именем проектировщика.
+    Нужны для расчетов сразу по всем проектировщикам.
+    """
+    engineers = pd.Series(
+        [engineer for engineer, rows in engineer_rows.items() for _ in rows],
+        index=[label for rows in engineer_rows.values() for label in rows],
+        dtype=pd.CategoricalDtype(list(engineer_rows)),
+    )
+    engineers = engineers[engineers.index.isin(df.index)]
+    return df.loc[engineers.index].assign(**{column: engineers.to_numpy()})
@@ -1,147 +1,95 @@
-from pandas.core.series import Series
+import re
 
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+from pandas.core.series import Series
 
-def count_sections(row: Series):
-    """Считает количество разделов."""
-    count = 0
-
-    ps = row["ПС"] == "Есть"
-    os = row["ОС"] == "Есть"
-    soue = row["СОУЭ"] == "Есть"
-    asv = row["Автоматизация систем вентиляции"] == "Есть"
-    characteristics = [ps, os, soue, asv]
-
-    for char in characteristics:
-        if char is True:
-            count += 1
-    return count
-
-
-def imperator(row: Series) -> bool:
-    """Объекты с трубной разводкой."""
-    if "Император" in row["Тип оборудования  пожаротушения (Заря/Император)"]:
-        return True
-    return False
-
-
-def count_types(row: Series) -> int:
-    """Считает количество типов оборудования в проекте."""
-    module_types = row["Тип оборудования  пожаротушения (Заря/Император)"].split(",")
-    return len(module_types)
-
-
-def count_modules(row: Series) -> int:
-    """Считает количество модулей."""
-    modules = row["Количество модулей"].strip()
-    try:
-        count = int(modules)
-    except ValueError:
-        if "\n" in modules:
-            modules = modules.split("\n")
-            count = 0
-            for integer in modules:
-                count += int(integer.strip())
-            return count
-        if "+" in modules:
-            modules = modules.split("+")
-            count = 0
-            for integer in modules:
-                count += int(integer.strip())
-            return count
-        return None
-    return count
-
-
-def count_amount_directions_modules(row: Series) -> int:
-    """
-    Считает количество направлений с учетом,
-    что каждый 20 модулей = 1 направлению.
+from src.salary_bonus.calculations.ingest import SECTIONS
+
+# ключевые слова типов объектов в порядке приоритета
+CONTAINER_TYPES = ["блок-контейнер", "контейнер"]
+FIRST_TYPES = [
+    "школа",
+    "больница",
+    "поликлин",
+    "медицинские учреждения",
+    "мед. учрежд",
+    "цгс",
+    "отделение",
+    "комиссариат",
+    "гараж",
+]
+SECOND_TYPES = ["адм. здание", "административное здание", "жк", "суд", "универ"]
+THIRD_TYPES = [
+    "производственное здание",
+    "пром. предприятие",
+    "выставка",
+    "музей",
+    "нии",
+    "завод",
+    "модульная станция",
+    "станция",
+    "фок",
+]
+FOURTH_TYPES = ["цод", "производственное здание", "пром. предприятие"]
+
+
+def _type_pattern(keywords: list[str]) -> re.Pattern:
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+TYPE_PATTERNS = [
+    _type_pattern(keywords)
+    for keywords in (
+        CONTAINER_TYPES,
+        FIRST_TYPES,
+        SECOND_TYPES,
+        THIRD_TYPES,
+        FOURTH_TYPES,
+    )
+]
+
+
+def set_projects_complexity(df: DataFrame) -> Series:
     """
-    amount_dirs = row["Количество направлений"].strip()
-    try:
-        amount_dirs = int(amount_dirs)
-    except ValueError:
-        amount_dirs = 0
-    count = count_modules(row)
-    if count:
-        count = count // 20
-        return count + amount_dirs
-    return amount_dirs
-
-
-def set_project_complexity(row: Series) -> int:  # noqa: C901
-    """
-    Устанавливает сложность объекта.
+    Устанавливает сложность объектов.
     Сложность расчитывается от 1 до 5.
+
+    Принимает типизированные данные архива (parse_project_archive).
+    Признаки считаются операциями над столбцами,
+    дерево решений - через np.select.
     """
-    amount_sections = count_sections(row)
+    index = df.index
+    equipment = df["Тип оборудования  пожаротушения (Заря/Император)"].astype("string")
 
-    has_imperator = imperator(row)
+    amount_sections = df[SECTIONS].sum(axis=1)
+    has_imperator = equipment.str.contains("Император", regex=False).fillna(False)
+    amount_types = equipment.str.count(",").fillna(0) + 1
 
-    amount_types = count_types(row)
+    # каждые 20 модулей = 1 направлению
+    amount_dirs = df["Количество направлений"].fillna(0)
+    amount_dirs += df["Количество модулей"].fillna(0) // 20
 
-    amount_dirs = count_amount_directions_modules(row)
+    sections = amount_sections.to_numpy() > 0
+    imp = has_imperator.to_numpy(dtype=bool)
+    types = amount_types.to_numpy()
+    dirs = amount_dirs.to_numpy()
 
-    container_type = ["блок-контейнер", "контейнер"]
-    first_type = [
-        "школа",
-        "больница",
-        "поликлин",
-        "медицинские учреждения",
-        "мед. учрежд",
-        "цгс",
-        "отделение",
-        "комиссариат",
-        "гараж",
+    is_type = [
+        df["Тип объекта"].str.contains(pattern).fillna(False).to_numpy(dtype=bool)
+        for pattern in TYPE_PATTERNS
     ]
-    second_type = ["адм. здание", "административное здание", "жк", "суд", "универ"]
-    third_type = [
-        "производственное здание",
-        "пром. предприятие",
-        "выставка",
-        "музей",
-        "нии",
-        "завод",
-        "модульная станция",
-        "станция",
-        "фок",
-    ]
-    fourth_type = ["цод", "производственное здание", "пром. предприятие"]
-
-    for type in container_type:
-        if type in row["Тип объекта"].strip().lower():
-            if has_imperator is True:
-                return 2
-            return 1
-    for type in first_type:
-        if type in row["Тип объекта"].strip().lower():
-            if amount_sections > 0 or has_imperator is True or amount_dirs >= 10:
-                return 2
-            return 1
-    for type in second_type:
-        if type in row["Тип объекта"].strip().lower():
-            if amount_dirs >= 18 or amount_sections > 0:
-                return 3
-            return 2
-    for type in third_type:
-        if type in row["Тип объекта"].strip().lower():
-            if amount_dirs >= 18 or (amount_dirs > 8 and has_imperator is True):
-                return 5
-            if amount_dirs > 8 or has_imperator is True:
-                return 4
-            return 3
-    for type in fourth_type:
-        if type in row["Тип объекта"].strip().lower():
-            if amount_dirs >= 20 or (amount_dirs >= 15 and amount_types > 1):
-                return 5
-            return 4
-
-    if amount_dirs <= 4:
-        return 2
-    if amount_dirs < 15:
-        return 3
-    if amount_dirs >= 20:
-        return 5
-    if amount_dirs >= 15 or amount_sections > 0 or has_imperator is True:
-        return 4
-    return 3
+
+    container = np.where(imp, 2, 1)
+    first = np.where(sections | imp | (dirs >= 10), 2, 1)
+    second = np.where((dirs >= 18) | sections, 3, 2)
+    third = np.select(
+        [(dirs >= 18) | ((dirs > 8) & imp), (dirs > 8) | imp], [5, 4], default=3
+    )
+    fourth = np.where((dirs >= 20) | ((dirs >= 15) & (types > 1)), 5, 4)
+    other = np.select([dirs <= 4, dirs < 15, dirs >= 20], [2, 3, 5], default=4)
+
+    complexity = np.select(is_type, [container, first, second, third, fourth], other)
+
+    return pd.Series(complexity, index=index, dtype=int)
@@ -1,334 +1,340 @@
 from datetime import datetime as dt
-from datetime import timedelta
-from typing import Union
 
-import holidays
+import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
 from pandas.core.series import Series
 
-pd.options.mode.chained_assignment = None
+from src.salary_bonus.calculations.business_days import calculate_deadlines
+from src.salary_bonus.calculations.ingest import DATE_FORMAT, SECTIONS, parse_integers
 
+pd.options.mode.chained_assignment = None
 
-def check_filled_projects(row: Series) -> bool:
-    """
-    Проверка на возможность подсчета баллов.
-    Если какие-то характеристики отсутствуют, подсчет невозможен.
-    """
-    characteristics = [
-        "Наименование объекта",
-        "Шифр (ИСП)",
-        "Тип объекта",
-        "Дата начала проекта",
+# (баллы, максимальное количество направлений) для каждой сложности
+DIRECTIONS_POINTS = {
+    1: [(1, 4), (1.5, 6), (2, 8), (2.5, 12), (3, 20)],
+    2: [(1, 2), (1.5, 4), (2, 8), (3, 12), (3.5, 20)],
+    3: [(1.5, 2), (2, 4), (2.5, 8), (3.5, 12), (4, 20)],
+    4: [(2, 2), (2.5, 4), (3, 8), (4, 12), (5, 20)],
+    5: [(4, 6), (5, 8), (6, 12), (8, 20)],
+}
+# (баллы, максимальная площадь) для каждой сложности
+SQUARE_POINTS = {
+    1: [(1, 400), (1.5, 1000), (2, 3000), (2.5, 10000), (3, 100000)],
+    2: [(2, 400), (2.5, 1000), (3, 3000), (3.5, 10000), (5, 100000)],
+    3: [(2, 400), (3, 1000), (3.5, 3000), (4, 10000), (8, 100000)],
+    4: [(3, 400), (4, 1000), (4.5, 3000), (5, 10000), (10, 100000)],
+    5: [(4, 400), (4.5, 1000), (5, 3000), (5.5, 10000), (12, 100000)],
+}
+
+DEADLINE_COEFFICIENT = 0.9
+NOT_FILLED = "Необходимо заполнить данные для расчёта"
+WRONG_DATES = "Некорректно введены даты"
+INVALID_DATA = "Некорректно введены данные для расчёта"
+NOT_SUBMITTED = " - предварительные баллы. Проект ещё не сдан."
+UNKNOWN_WORK = "Неизвестный тип работы, невозможно сделать рассчёт"
+
+# статус баллов: причина, по которой вместо баллов на лист выводится
+# предупреждение (NaN - баллы посчитаны)
+POINTS_STATUS = pd.CategoricalDtype(
+    [
+        NOT_FILLED,
+        INVALID_DATA,
+        WRONG_DATES,
+        f"{WRONG_DATES}.",
+        NOT_SUBMITTED,
+        UNKNOWN_WORK,
     ]
-    if "блок-контейнер" in row["Тип объекта"].strip().lower():
-        return True
-    for char in characteristics:
-        if row[f"{char}"] == "" or row[f"{char}"] is None:
-            return False
-    return True
+)
 
 
-def check_amount_directions(comp: int, amount: str) -> int:
-    """
-    Расчитывает баллы за количество направлений
-    в зависимости от сложности объекта.
-    До 20 направлений баллы расчитываются по таблице complexity.
-    Если направлений больше 20, баллы расчитываются по формуле:
-    round((amount/(8.5-comp) + comp/2),1)
-    """
-    complexity = {
-        1: [(1, 4), (1.5, 6), (2, 8), (2.5, 12), (3, 20)],
-        2: [(1, 2), (1.5, 4), (2, 8), (3, 12), (3.5, 20)],
-        3: [(1.5, 2), (2, 4), (2.5, 8), (3.5, 12), (4, 20)],
-        4: [(2, 2), (2.5, 4), (3, 8), (4, 12), (5, 20)],
-        5: [(4, 6), (5, 8), (6, 12), (8, 20)],
-    }
-    try:
-        amount = int(amount)
-    except ValueError:
-        return 0
-
-    for i in range(1, 6):
-        if comp == i:
-            for point_amount in complexity[i]:
-                if amount <= point_amount[1]:
-                    return point_amount[0]
-            return round((amount / (8.5 - comp) + comp / 2), 1)
-    return None
-
-
-def define_square(square: str) -> float:
-    """
-    Подготавливает введенные данные площади для дальнейших вычислений.
-    """
-    try:
-        square = float(square)
-    except ValueError:
-        if "," in square:
-            numbers = square.split(",")
-            square = float(numbers[0])
-        else:
-            square = 1.0
-    return square
-
-
-def check_square(comp: int, row: Series) -> int:
-    """
-    Расчитывает баллы в зависимости от площади
-    защищаемого помещения, сложности объекта и проделанной работы.
+def _lookup_table(table: dict[int, list[tuple]]) -> tuple[np.ndarray, np.ndarray]:
     """
-    count = 0
-    try:
-        square = float(row["Площадь защищаемых помещений (м^2)"])
-    except ValueError:
-        square = define_square(row["Площадь защищаемых помещений (м^2)"])
-
-    ps = row["ПС"] == "Есть"
-    os = row["ОС"] == "Есть"
-    soue = row["СОУЭ"] == "Есть"
-    asv = row["Автоматизация систем вентиляции"] == "Есть"
-    characteristics = [ps, os, soue, asv]
-
-    complexity = {
-        1: [(1, 400), (1.5, 1000), (2, 3000), (2.5, 10000), (3, 100000)],
-        2: [(2, 400), (2.5, 1000), (3, 3000), (3.5, 10000), (5, 100000)],
-        3: [(2, 400), (3, 1000), (3.5, 3000), (4, 10000), (8, 100000)],
-        4: [(3, 400), (4, 1000), (4.5, 3000), (5, 10000), (10, 100000)],
-        5: [(4, 400), (4.5, 1000), (5, 3000), (5.5, 10000), (12, 100000)],
-    }
-
-    for i in range(1, 6):
-        if comp == i:
-            for point_square in complexity[i]:
-                if square <= point_square[1]:
-                    points = point_square[0]
-                    break
-    for char in characteristics:
-        if char is True:
-            count += points
-    return count
-
-
-def check_sot_skud(row: Series) -> int:
-    """Расчитывает баллы в зависимости от СОТ, СКУД."""
-    points = 0
-    try:
-        stm = int(row["СОТ (количество камер)"])
-    except ValueError:
-        stm = 0
-    try:
-        skud = int(row["СКУД (количество точек доступа)"])
-    except ValueError:
-        skud = 0
-    characteristics = [stm, skud]
-
-    for char in characteristics:
-        if char > 0:
-            if char <= 10:
-                points += 1
-            elif char <= 20:
-                points += 1.5
-            else:
-                points += 2
-    return points
-
-
-def check_cultural_heritage(row: Series) -> int:
+    Переводит таблицу баллов в массивы (пороги, баллы) размером 5 x N,
+    где строка i - сложность i + 1. Короткие строки дополняются
+    последним порогом.
     """
-    Проверяет, считается ли объект культурным наследием.
-    Если считается, то прибавляется 3 балла.
-    """
-    if row["Объект культурного наследия"] == "Да":
-        return 3
-    return 0
+    width = max(len(points) for points in table.values())
+    thresholds = np.empty((5, width))
+    points = np.empty((5, width))
+    for comp, row in table.items():
+        row = row + [row[-1]] * (width - len(row))
+        points[comp - 1] = [point for point, _ in row]
+        thresholds[comp - 1] = [threshold for _, threshold in row]
+    return thresholds, points
 
 
-def check_net(row: Series) -> int:
-    """
-    Проверяет, закладываются ли сети в проект.
-    """
-    if row["Сети"] == "Есть":
-        return 1.5
-    return 0
+DIRECTIONS_THRESHOLDS, DIRECTIONS_TABLE = _lookup_table(DIRECTIONS_POINTS)
+SQUARE_THRESHOLDS, SQUARE_TABLE = _lookup_table(SQUARE_POINTS)
 
 
-def check_authors(authors: str) -> int:
+def count_base_points(df: DataFrame) -> Series:
     """
-    Считает количество проектировщиков, разрабатывающих проект.
+    Считает баллы за проекты без учета дедлайна: направления, площадь,
+    СОТ и СКУД, культурное наследие, сети, деленные на количество
+    проектировщиков. Пороги таблиц баллов хранятся в массивах NumPy,
+    поиск по ним идет для всего столбца сразу.
+
+    Принимает типизированные данные архива (parse_project_archive).
+    Для строк, по которым баллы посчитать нельзя (сложность не от 1 до 5,
+    нераспознанная площадь или площадь больше максимальной при наличии
+    разделов), возвращает NaN.
     """
-    authors = authors.strip()
-    if "," in authors:
-        authors = authors.split(",")
-        return len(authors)
-    return 1
-
-
-def calculate_deadline(start_date: dt.date, work_days: int, row: Series) -> dt.date:
-    """Расчитывает дату дедлайна, исходя из
-    даты начала и количества рабочих дней."""
-    current_date = start_date
-    days_added = 0
-    ru_holidays = holidays.RU()
-
-    while days_added < work_days:
-        if current_date.weekday() < 5 and current_date not in ru_holidays:
-            days_added += 1
-        current_date += timedelta(days=1)
-
-    try:
-        plus_days = int(row["Продление дедлайна"])
-        current_date += timedelta(days=plus_days)
-    except ValueError:
-        plus_days = 0
-
-    return current_date - timedelta(days=1)
-
-
-def check_spend_time(
-    row: Series, points: int, df: DataFrame, amount: int, archive_sh: bool = True
-) -> float | str:
+    comp = parse_integers(df["Сложность для расчета"]).to_numpy()
+    regular = (comp >= 1) & (comp <= 5)
+    comp_index = np.where(regular, comp, 1).astype(int) - 1
+
+    amount = df["Количество направлений"].to_numpy(dtype=float)
+    parsed_amount = ~np.isnan(amount)
+    amount = np.nan_to_num(amount)
+    dirs_index = (amount[:, None] > DIRECTIONS_THRESHOLDS[comp_index]).sum(axis=1)
+    in_table = dirs_index < DIRECTIONS_THRESHOLDS.shape[1]
+    dirs_points = DIRECTIONS_TABLE[comp_index, np.where(in_table, dirs_index, 0)]
+    over_table = np.flatnonzero(parsed_amount & ~in_table)
+    dirs_points[over_table] = [
+        round(float(a) / (8.5 - int(c)) + int(c) / 2, 1)
+        for a, c in zip(amount[over_table], comp_index[over_table] + 1)
+    ]
+    dirs_points[~parsed_amount] = 0
+
+    square = df["Площадь защищаемых помещений (м^2)"].to_numpy(dtype=float)
+
+    amount_sections = df[SECTIONS].sum(axis=1).to_numpy()
+    # пороги площади одинаковы для всех сложностей
+    square_index = np.searchsorted(SQUARE_THRESHOLDS[0], np.nan_to_num(square))
+    in_table = square_index < SQUARE_THRESHOLDS.shape[1]
+    square_points = SQUARE_TABLE[comp_index, np.where(in_table, square_index, 0)]
+    # без разделов площадь не влияет на баллы
+    regular &= ~np.isnan(square) & (in_table | (amount_sections == 0))
+    square_points = np.where(amount_sections > 0, square_points * amount_sections, 0)
+
+    sot_skud = 0
+    for column in ("СОТ (количество камер)", "СКУД (количество точек доступа)"):
+        count = np.nan_to_num(df[column].to_numpy(dtype=float))
+        sot_skud = sot_skud + np.select(
+            [count <= 0, count <= 10, count <= 20], [0, 1, 1.5], default=2
+        )
+
+    heritage = np.where(df["Объект культурного наследия"], 3, 0)
+    net = np.where(df["Сети"], 1.5, 0)
+    authors = df["Количество авторов"].to_numpy()
+
+    points = (dirs_points + square_points + sot_skud + heritage + net) / authors
+    return pd.Series(np.where(regular, points, np.nan), index=df.index)
+
+
+def check_deadlines(
+    df: DataFrame,
+    errors: DataFrame,
+    work_days: Series,
+    evaluated: Series,
+    key_column: str = "Шифр (ИСП)",
+    by: str | None = None,
+) -> DataFrame:
     """
-    Проверка на соблюдение дедлайнов проекта.
-    Если проект выполнен в срок из расчета 1 балл = 5 рабочим дням,
-    остаются те же баллы. Если дедлайн был просрочен, полученные
-    баллы умножаются на понижающий коэффициент.
+    Проверка на соблюдение дедлайнов сразу для всех проектов таблицы.
+    Дедлайн - work_days рабочих дней от даты начала проекта
+    плюс продление дедлайна.
 
     Args:
-        row (Series): строка с данными проекта
-        points (int): баллы за проект
-        df (DataFrame): весь датафрейм таблицы
-        amount (int): кол-во блок-контейнеров
-        archive_sh (bool): данные с таблицы архив проектов
-    """
-    coefficient = 0.9
-    if archive_sh and "блок-контейнер" in row["Тип объекта"].strip().lower():
-        days_deadline = amount + 4
-    else:
-        days_deadline = points * 5
-
-    try:
-        start_date = dt.strptime(row["Дата начала проекта"], "%d.%m.%Y").date()
-    except ValueError:
-        return "Некорректно введены даты"
-
-    deadline = calculate_deadline(start_date, days_deadline, row)
-    deadline_str = deadline.strftime("%d.%m.%Y")
-
-    if archive_sh:
-        df.loc[df["Шифр (ИСП)"] == row["Шифр (ИСП)"], "Дедлайн"] = deadline_str
-    else:
-        df.loc[
-            # df["Шифр проекта/Номера расчета (ТактГаз)"]
-            # == row["Шифр проекта/Номера расчета (ТактГаз)"],
-            df["Наименование объекта"] == row["Наименование объекта"],
-            "Дедлайн",
-        ] = deadline_str
-
-    try:
-        end_date = dt.strptime(row["Дата окончания проекта"], "%d.%m.%Y").date()
-    except ValueError:
-        end_date = None
-        if row["Дата окончания проекта"] == "":
-            return f"{points} - предварительные баллы. Проект ещё не сдан."
-        return "Некорректно введены даты."
-
-    if end_date:
-        if deadline < end_date:
-            points = points * coefficient
-
-    return points
-
-
-def count_deadline_for_blocks(row: Series, df: DataFrame, points: int):
-    """Отсортировывает блок-контейнеры по группам,
-    чтобы посчитать для них общий дедлайн.
-    Для одиночных контейнеров дедлайн считается, как для обычных проектов.
+        df (DataFrame): типизированные данные таблицы
+        errors (DataFrame): маска ошибок разбора данных таблицы
+        work_days (Series): количество рабочих дней на проект
+        evaluated (Series): маска проектов, для которых идет расчет
+        key_column (str): столбец, по которому дедлайн проставляется
+            всем строкам одного проекта
+        by (str | None): столбец с проектировщиком, если таблица
+            содержит проекты нескольких проектировщиков: дедлайн
+            проставляется только строкам проекта того же проектировщика
+
+    Returns:
+        DataFrame с индексом df и столбцами:
+            "Дедлайн" (str) - дедлайн для вывода на лист: дедлайн последней
+                рассчитанной строки с тем же key_column, для строк
+                с пустым key_column - свой дедлайн;
+            "Просрочен" (bool) - дедлайн раньше даты окончания проекта;
+            "Дедлайн просрочен" (bool) - дедлайн для вывода на лист раньше
+                даты окончания проекта, а для несданных проектов - уже прошел;
+            "Статус" (POINTS_STATUS) - некорректные даты
+                или предварительные баллы.
     """
-    name = row["Наименование объекта"]
-    start = row["Дата начала проекта"]
-    end = row["Дата окончания проекта"]
-
-    filtered_df = df[
-        (df["Наименование объекта"] == name)
-        & (df["Дата начала проекта"] == start)
-        & (df["Дата окончания проекта"] == end)
-    ]
-    num_rows = filtered_df.shape[0]
-
-    if num_rows == 1:
-        row["Тип объекта"] = "единственный контейнер"
-    return check_spend_time(row, points, df, amount=num_rows)
-
-
-def count_block(row: Series, blocks: list[str], points: int, df: DataFrame) -> float:
+    start = df["Дата начала проекта"]
+    end = df["Дата окончания проекта"]
+    extension = df["Продление дедлайна"].fillna(0).astype(int)
+    has_start = evaluated & start.notna()
+
+    deadline = calculate_deadlines(start.where(has_start), work_days, extension)
+    previous = df["Дедлайн"] if "Дедлайн" in df.columns else np.nan
+    # строки с пустым ключом не относятся к одному проекту
+    # и сохраняют свой дедлайн
+    key = df[key_column].astype("string").str.strip().replace("", pd.NA)
+    keys = [key] if by is None else [df[by], key]
+    shown = deadline.groupby(keys, observed=True).transform("last")
+    shown = shown.where(key.notna(), deadline)
+    deadline_str = shown.dt.strftime(DATE_FORMAT)
+    deadline_str = deadline_str.where(deadline_str.notna(), previous)
+    today = pd.Timestamp(dt.now().date())
+
+    no_end = has_start & end.isna()
+    not_submitted = no_end & ~errors["Дата окончания проекта"]
+    status = pd.Series(np.nan, index=df.index, dtype=POINTS_STATUS)
+    status[evaluated & start.isna()] = WRONG_DATES
+    status[not_submitted] = NOT_SUBMITTED
+    status[no_end & ~not_submitted] = f"{WRONG_DATES}."
+
+    return DataFrame(
+        {
+            "Дедлайн": deadline_str,
+            "Просрочен": has_start & (deadline < end),
+            "Дедлайн просрочен": shown < end.fillna(today),
+            "Статус": status,
+        }
+    )
+
+
+def round_points(points: Series) -> Series:
+    """Округляет баллы до десятых встроенным round, как при построчном расчете."""
+    return pd.Series([round(value, 1) for value in points], index=points.index)
+
+
+def check_filled_projects(df: DataFrame, errors: DataFrame) -> Series:
     """
-    Расчитывает баллы для блок-контейнеров.
-    За первый разработанный объект - 1 балл,
-    за остальные - 0.5 балла.
+    Проверка на возможность подсчета баллов.
+    Если какие-то характеристики отсутствуют, подсчет невозможен.
     """
-    name = row["Наименование объекта"]
-
-    points = count_deadline_for_blocks(row, df, points)
+    characteristics = df[["Наименование объекта", "Шифр (ИСП)", "Тип объекта"]]
+    no_start = df["Дата начала проекта"].isna() & ~errors["Дата начала проекта"]
+    return ~(characteristics.eq("") | characteristics.isna()).any(axis=1) & ~no_start
 
-    if name in blocks:
-        if isinstance(points, float):
-            return 0.5 * points
-    blocks.append(name)
-    return points
 
-
-def count_points(row: Series, df: DataFrame, blocks: list) -> Union[int, str]:
-    """
-    Считает и возвращает сумму полученных баллов.
-    Если подсчет произвести невозможно, то возвращает
-    строку-предупреждение об этом.
+def count_blocks(df: DataFrame, blocks: Series, by: str | None = None) -> DataFrame:
     """
-    points = 0
-    filled_project = check_filled_projects(row)
-    if not filled_project:
-        return "Необходимо заполнить данные для расчёта"
-    if "да" in row["Является корректировкой"].strip().lower():
-        return count_adjusting_points(row, df)
+    Группирует блок-контейнеры для расчета баллов.
 
-    complexity = int(row["Сложность для расчета"])
+    Контейнеры одного объекта с одинаковыми датами начала и окончания
+    сдаются вместе: у группы общий дедлайн - количество контейнеров
+    в группе + 4 рабочих дня. Одиночный контейнер считается, как обычный
+    проект. За первый разработанный проектировщиком контейнер объекта
+    дается полный балл, за остальные - половина.
 
-    points += check_amount_directions(complexity, row["Количество направлений"])
-    points += check_square(complexity, row)
-    points += check_sot_skud(row)
-    points += check_cultural_heritage(row)
-    points += check_net(row)
-    points = points / check_authors(row["Разработал"])
-
-    if "блок-контейнер" in row["Тип объекта"].strip().lower():
-        return count_block(row, blocks, points, df)
+    Args:
+        df (DataFrame): весь датафрейм таблицы
+        blocks (Series): маска блок-контейнеров, для которых идет расчет
+        by (str | None): столбец с проектировщиком, если таблица
+            содержит проекты нескольких проектировщиков: группы
+            и нумерация контейнеров считаются по проектам каждого
+            проектировщика отдельно
+
+    Returns:
+        DataFrame с индексом df и столбцами:
+            "Количество" (int) - количество строк в группе контейнера;
+            "Коэффициент" (float) - 1.0 для первого контейнера объекта,
+                0.5 для остальных, NaN для строк, не являющихся контейнерами.
+    """
+    engineer = [] if by is None else [by]
+    amount = df.groupby(
+        engineer
+        + ["Наименование объекта", "Дата начала проекта", "Дата окончания проекта"],
+        dropna=False,
+        observed=True,
+    )["Наименование объекта"].transform("size")
 
-    points = check_spend_time(row, points, df, amount=0)
+    rank = (
+        df.loc[blocks]
+        .groupby(engineer + ["Наименование объекта"], dropna=False, observed=True)
+        .cumcount()
+    )
+    weight = pd.Series(np.where(rank == 0, 1.0, 0.5), index=rank.index)
 
-    if isinstance(points, str):
-        return points
+    return DataFrame({"Количество": amount, "Коэффициент": weight}, index=df.index)
 
-    return round(points, 1)
 
+def count_points(df: DataFrame, errors: DataFrame, by: str | None = None) -> DataFrame:
+    """
+    Считает баллы за проекты сразу для всей таблицы.
+    Если подсчет для проекта произвести невозможно, баллы - NaN,
+    а причина записывается в статус баллов.
 
-def count_adjusting_points(row: Series, df: DataFrame) -> float:
+    Args:
+        df (DataFrame): типизированные данные архива (parse_project_archive)
+            со столбцом "Сложность для расчета"
+        errors (DataFrame): маска ошибок разбора данных архива
+        by (str | None): столбец с проектировщиком, если таблица содержит
+            проекты нескольких проектировщиков (см. rows_by_engineer).
+            Блок-контейнеры и дедлайны считаются по проектам
+            каждого проектировщика, как на его листе
+
+    Returns:
+        DataFrame с индексом df и столбцами:
+            "Баллы" (float) - баллы за проект, для несданных проектов -
+                предварительные баллы;
+            "Статус баллов" (POINTS_STATUS) - NaN, если баллы посчитаны;
+            "Дедлайн" (str), "Дедлайн просрочен" (bool) - см. check_deadlines.
     """
-    Расчитывает баллы за корректировки:
-    30 процентов от баллов за готовый проект.
+    is_block = df["Тип объекта"].str.contains("блок-контейнер", regex=False)
+    is_block = is_block.fillna(False).astype(bool)
+    filled = is_block | check_filled_projects(df, errors)
+    adjusting = filled & df["Является корректировкой"]
+
+    base_points = count_base_points(df)
+    invalid = filled & base_points.isna()
+    evaluated = filled & ~invalid
+    blocks = evaluated & is_block & ~adjusting
+    normal = evaluated & ~is_block & ~adjusting
+    adjusting &= evaluated
+
+    containers = count_blocks(df, blocks, by)
+    work_days = base_points * 5
+    work_days[is_block & adjusting] = 4
+    grouped = blocks & (containers["Количество"] > 1)
+    work_days[grouped] = containers["Количество"] + 4
+
+    deadlines = check_deadlines(df, errors, work_days, evaluated, by=by)
+    status = deadlines["Статус"]
+    numeric = status.isna()
+    points = base_points.mask(deadlines["Просрочен"], base_points * DEADLINE_COEFFICIENT)
+
+    result = pd.Series(np.nan, index=df.index)
+    result[normal] = round_points(points[normal])
+    result[adjusting] = round_points(points[adjusting] * 0.3)
+    result[blocks] = points[blocks] * containers["Коэффициент"].where(numeric, 1.0)
+    result[~numeric] = np.nan
+    preliminary = status == NOT_SUBMITTED
+    result[preliminary] = base_points[preliminary]
+
+    status[~filled] = NOT_FILLED
+    status[invalid] = INVALID_DATA
+
+    return DataFrame(
+        {
+            "Баллы": result,
+            "Статус баллов": status,
+            "Дедлайн": deadlines["Дедлайн"],
+            "Дедлайн просрочен": deadlines["Дедлайн просрочен"],
+        }
+    )
+
+
+def render_number(points: float) -> float | int:
+    """Целые баллы выводятся без дробной части: 2, а не 2.0."""
+    return int(points) if float(points).is_integer() else points
+
+
+def render_points(df: DataFrame) -> Series:
     """
-    points = 0
-
-    complexity = int(row["Сложность для расчета"])
-
-    points += check_amount_directions(complexity, row["Количество направлений"])
-    points += check_square(complexity, row)
-    points += check_sot_skud(row)
-    points += check_cultural_heritage(row)
-    points += check_net(row)
-    points = points / check_authors(row["Разработал"])
-    points = check_spend_time(row, points, df, amount=0)
-
-    if isinstance(points, str):
-        return points
-
-    return round(points * 0.3, 1)
+    Значения столбца "Баллы" для вывода на лист: баллы
+    или предупреждение из статуса баллов.
+    """
+    status = df["Статус баллов"]
+    preliminary = status == NOT_SUBMITTED
+    warning = status.notna() & ~preliminary
+    points = df["Баллы"]
+    numeric = points.notna()
+
+    rendered = points.astype("object")
+    rendered[numeric] = points[numeric].map(render_number)
+    rendered[warning] = status[warning].astype("object")
+    rendered[preliminary] = points[preliminary].map(
+        lambda p: f"{render_number(p)}{NOT_SUBMITTED}"
+    )
+    return rendered
@@ -1,61 +1,82 @@
-import time
-
 import pandas as pd
 from pandas.core.frame import DataFrame
 
+from src.salary_bonus.calculations.ingest import parse_project_archive
 from src.salary_bonus.calculations.mounth_points import (
     calculate_by_month,
     empty_months_df,
+    split_by,
+)
+from src.salary_bonus.calculations.partition import (
+    assigned_rows,
+    partition_by_engineer,
+    rows_by_engineer,
 )
 from src.salary_bonus.calculations.project_archive.complexity import (
-    set_project_complexity,
+    set_projects_complexity,
 )
 from src.salary_bonus.calculations.project_archive.counting_points import count_points
-from src.salary_bonus.config.defaults import AFTER_ENG_SLEEP
 from src.salary_bonus.logger import logging
 from src.salary_bonus.notification.telegram.bot import TelegramNotifier
-from src.salary_bonus.utils import is_point
-from src.salary_bonus.worksheets.worksheets import (
-    connect_to_engineer_ws,
-    send_project_data_to_spreadsheet,
-)
+from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
+from src.salary_bonus.worksheets.worksheets import send_project_data_to_spreadsheet
 
 
-def correct_complexity(engineer: str, engineer_projects: DataFrame) -> DataFrame:
+def correct_complexity(df: DataFrame, corrections: dict[str, pd.Series]) -> DataFrame:
     """
-    Берёт данные о корректировке сложности из таблицы проектировщика
-    и заменяет неверные данные.
+    Добавляет корректировки сложности с листов проектировщиков
+    (столбец "Корректировка сложности") и заменяет ими неверные данные
+    о сложности.
+
+    df - проекты, повторенные для каждого проектировщика (rows_by_engineer).
+    Корректировки с листа проектировщика относятся к его проектам в том
+    порядке, в котором проекты выведены на его лист, и влияют только
+    на его баллы.
     """
     logging.info("Проверка на необходимость корректировки сложности проектов.")
-    worksheet = connect_to_engineer_ws(engineer, False)
-
-    if worksheet:
-        raw_data = worksheet.get("J1:J200")
-
-        try:
-            new_coplexity = pd.DataFrame(raw_data[1:], columns=raw_data[0])
-        except ValueError:
-            new_coplexity = pd.DataFrame(columns=["Корректировка сложности"])
-
-        if not new_coplexity.empty:
-            engineer_projects["Корректировка сложности"] = new_coplexity[
-                "Корректировка сложности"
-            ]
-            if "Корректировка сложности" in engineer_projects.columns:
-                engineer_projects["Сложность для расчета"] = engineer_projects[
-                    "Корректировка сложности"
-                ].combine_first(engineer_projects["Сложность для расчета"])
-                logging.info(
-                    "Скорректировали сложность проектов "
-                    "по данным с листа проектировщика."
-                )
+    df["Корректировка сложности"] = pd.Series(None, index=df.index, dtype="object")
+
+    if corrections:
+        # номер проекта на листе проектировщика
+        position = df.groupby("Проектировщик", observed=True).cumcount()
+        sheet_rows = pd.MultiIndex.from_arrays(
+            [df["Проектировщик"].astype("object"), position]
+        )
+        by_sheet_row = pd.concat(
+            {
+                engineer: values.reset_index(drop=True)
+                for engineer, values in corrections.items()
+            }
+        )
+        df["Корректировка сложности"] = by_sheet_row.reindex(sheet_rows).to_numpy()
+
+    corrected = df["Корректировка сложности"].notna()
+    if not corrected.any():
         logging.info("Корректировка сложности не нужна.")
-    return engineer_projects
+        return df
+
+    df["Сложность для расчета"] = df["Корректировка сложности"].combine_first(
+        df["Сложность для расчета"]
+    )
+    logging.info("Скорректировали сложность проектов по данным с листов проектировщиков.")
+    return df
+
+
+def send_engineer_projects(engineer: str, projects: dict[str, DataFrame]) -> DataFrame:
+    """
+    Добавляет проекты проектировщика в план записи его листа.
+    Возвращает проекты проектировщика.
+    """
+    send_project_data_to_spreadsheet(projects[engineer], engineer)
+    return projects[engineer]
 
 
 async def process_project_archive_data(
-    df: DataFrame | None, engineers: list[str], tg_bot: TelegramNotifier
-) -> tuple[dict[str, DataFrame], dict[str, DataFrame]]:
+    df: DataFrame | None,
+    engineers: list[str],
+    tg_bot: TelegramNotifier,
+    corrections: dict[str, pd.Series],
+) -> tuple[dict[str, DataFrame], dict[str, DataFrame], DataFrame | None]:
     """
     Собирает данные из архива проектов, производит расчет баллов
     и отправляет полученные данные в таблицу "Премирование"
@@ -68,14 +89,19 @@ async def process_project_archive_data(
         df (DataFrame): данные из таблицы проектов
         engineers (list[str]): список инженеров, для которых надо делать расчет
         tg_bot (TelegramNotifier): тг-бот для отправки уведомлений
+        corrections (dict[str, pd.Series]): корректировки сложности
+            с листов проектировщиков
 
     Returns:
-        tuple[dict[str, DataFrame], dict[str, DataFrame]]: кортеж из двух
-        словарей. Первый содержит рассчитанные данные по месяцам, где key -
-        проектировщик, value - DataFrame вида:
+        tuple[dict[str, DataFrame], dict[str, DataFrame], DataFrame | None]:
+        кортеж из двух словарей и архива. Первый словарь содержит
+        рассчитанные данные по месяцам, где key - проектировщик,
+        value - DataFrame вида:
         | Месяц (pandas.Period("YYYY-MM", freq="M")) | Баллы (float) |.
         Второй содержит данные по проектам из основной таблицы, где key -
         проектировщик, value - DataFrame с исходными строками проектов.
+        Архив - типизированные данные всей таблицы (parse_project_archive),
+        если таблица не найдена или пуста - df.
     """
     results: dict[str, DataFrame] = {}
     eng_data: dict[str, DataFrame] = {}
@@ -85,59 +111,70 @@ async def process_project_archive_data(
             'Ошибка: таблица "Таблица проектов" не найдена.\n'
             "Возможно название было сменено.",
         )
-        return results, eng_data
+        return results, eng_data, df
     elif isinstance(df, pd.DataFrame) and df.empty:
         msg = "Основная таблица проектов пуста, расчет по ней не будет произведен."
         logging.warning(msg)
-        return results, eng_data
+        return results, eng_data, df
+
+    engineer_rows = partition_by_engineer(df, engineers)
+
+    # архив разбирается один раз: типизированные данные нужны и для баллов,
+    # и для суммы заложенного оборудования; сложность считается один раз
+    # для каждого проекта
+    archive, archive_errors = parse_project_archive(df)
+    assigned = assigned_rows(df, engineer_rows)
+    projects = df.loc[assigned]
+    typed, errors = archive.loc[assigned], archive_errors.loc[assigned]
+
+    logging.info("Определение сложности проектов.")
+    projects["Автоматически определенная сложность"] = set_projects_complexity(typed)
+    typed["Автоматически определенная сложность"] = projects[
+        "Автоматически определенная сложность"
+    ]
+
+    # баллы зависят от листа проектировщика: корректировки сложности,
+    # нумерация блок-контейнеров и дедлайны считаются по его проектам,
+    # поэтому баллы считаются сразу для всех пар проектировщик - проект
+    projects = rows_by_engineer(projects, engineer_rows).reset_index(drop=True)
+    typed = rows_by_engineer(typed, engineer_rows).reset_index(drop=True)
+    errors = rows_by_engineer(errors, engineer_rows).reset_index(drop=True)
+    typed["Дедлайн"] = ""
+    typed["Сложность для расчета"] = typed["Автоматически определенная сложность"]
+    typed = correct_complexity(typed, corrections)
+    projects["Сложность для расчета"] = typed["Сложность для расчета"]
+    projects["Корректировка сложности"] = typed["Корректировка сложности"]
+
+    logging.info("Подсчет баллов за проекты.")
+    points = count_points(typed, errors, by="Проектировщик")
+    projects[points.columns] = points
+
+    # баллы по месяцам считаются сразу для всех проектировщиков
+    scored = typed[points["Статус баллов"].isna()].assign(Баллы=points["Баллы"])
+    monthly = split_by(
+        calculate_by_month(scored, column="Баллы", by="Проектировщик"),
+        by="Проектировщик",
+    )
+    scored_engineers = set(scored["Проектировщик"])
+
+    # листы проектировщиков с данными основной таблицы готовятся одновременно
+    eng_data = await sheets_manager.run_for_each(
+        send_engineer_projects,
+        [engineer for engineer in engineers if engineer in engineer_rows],
+        split_by(projects, by="Проектировщик"),
+    )
 
     for engineer in engineers:
-        logging.info(f"Начинается расчет баллов для проектировщика {engineer}.")
-        blocks = []
-        engineer_projects = df.loc[
-            df["Разработал"].str.contains(f"{engineer}")
-        ].reset_index(drop=True)
-
-        if engineer_projects.empty:
+        logging.info(f"Подготовка баллов для проектировщика {engineer}.")
+        if engineer not in engineer_rows:
             logging.info(f"Нет проектов у проектировщика {engineer}.")
             continue
 
-        engineer_projects["Дедлайн"] = ""
-
-        logging.info("Определение сложности проектов.")
-        engineer_projects["Автоматически определенная сложность"] = (
-            engineer_projects.apply(set_project_complexity, axis=1)  # noqa: E501
-        )
-        engineer_projects["Сложность для расчета"] = engineer_projects[
-            "Автоматически определенная сложность"
-        ]
-        engineer_projects = correct_complexity(engineer, engineer_projects)
-
-        logging.info("Подсчет баллов за проекты.")
-        engineer_projects["Баллы"] = engineer_projects.apply(
-            count_points, axis=1, args=(engineer_projects, blocks)
-        )
-
-        eng_data[engineer] = engineer_projects  # записываем данные с основной таблицы
-        send_project_data_to_spreadsheet(engineer_projects, engineer)
-
-        engineer_projects_filt = engineer_projects[
-            engineer_projects["Баллы"].apply(is_point)
-        ]
-
-        if not engineer_projects_filt.empty:
-            months = calculate_by_month(engineer_projects_filt, column="Баллы")
-            results[engineer] = months
-            logging.info(
-                f"Расчет баллов для проектировщика {engineer} завершен. "
-                f"Ждем 10 секунд."
-            )
+        if engineer in scored_engineers:
+            results[engineer] = monthly[engineer]
+            logging.info(f"Расчет баллов для проектировщика {engineer} завершен.")
         else:
             results[engineer] = empty_months_df(column="Баллы")
-            logging.info(
-                f"Нет готовых проектов у проектировщика {engineer}. "
-                f"Переходим к следующему проектировщику через 10 секунд."
-            )
-        time.sleep(AFTER_ENG_SLEEP)
+            logging.info(f"Нет готовых проектов у проектировщика {engineer}.")
 
-    return results, eng_data
+    return results, eng_data, archive
@@ -1,6 +1,6 @@
+import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
-from pandas.core.indexes.period import PeriodIndex
 from pandas.core.series import Series
 
 from src.salary_bonus.config.defaults import CURRENT_YEAR
@@ -9,93 +9,102 @@ from src.salary_bonus.logger import logging
 pd.options.mode.chained_assignment = None
 
 
-def find_period(row: DataFrame) -> PeriodIndex:
+def dates_from_cipher(cipher: Series) -> tuple[Series, Series]:
     """
-    Расчитывает период от даты начала и конца.
-    Дату начала берет из шифра ИСП. Дата окончания считается концом месяца.
+    Расчитывает период из шифра ИСП вида "ГГГГ-ММ...":
+    с 1 по 28 число месяца шифра.
     """
-    try:
-        quarters = pd.period_range(
-            start=row["Дата начала проекта"], end=row["Дата окончания проекта"], freq="Q"
-        )
-    except ValueError:
-        month = row["Шифр (ИСП)"][5:7]
-        year = row["Шифр (ИСП)"][:4]
-        row["Дата начала проекта"] = pd.to_datetime(
-            f"01.{month}.{year}", format="%d.%m.%Y"
-        )
-        row["Дата окончания проекта"] = pd.to_datetime(
-            f"28.{month}.{year}", format="%d.%m.%Y"
-        )
-        quarters = pd.period_range(
-            start=row["Дата начала проекта"], end=row["Дата окончания проекта"], freq="Q"
-        )
-
-    return quarters
-
-
-def calculate_quarter_points(row: Series, colomn: str) -> list[dict]:
-    """
-    Производит распределение баллов по кварталам.
-    Если проект был выполнен в течение одного квартала,
-    все баллы пойдут в этот квартал.
+    cipher = cipher.astype("string")
+    month_year = cipher.str[5:7] + "." + cipher.str[:4]
+    start = pd.to_datetime("01." + month_year, format="%d.%m.%Y", errors="coerce")
+    end = pd.to_datetime("28." + month_year, format="%d.%m.%Y", errors="coerce")
+    return start, end
 
-    Если проект был выполнен в течение нескольких кварталов,
-    то баллы будут распределены по кварталам пропорционально времени,
-    потраченному на проект в каждом квартале.
+
+def split_by_periods(
+    start_dates: Series, end_dates: Series, freq: str = "Q"
+) -> DataFrame:
     """
-    row["Дата начала проекта"] = pd.to_datetime(
-        row["Дата начала проекта"], dayfirst=True, format="%d.%m.%Y"
-    )
-    row["Дата окончания проекта"] = pd.to_datetime(
-        row["Дата окончания проекта"], dayfirst=True, format="%d.%m.%Y"
+    Разбивает проекты на периоды (кварталы - "Q", месяцы - "M"),
+    в которых они выполнялись.
+
+    Доля периода - количество дней проекта в периоде, деленное на
+    длительность проекта (обе даты включительно). Если дата начала
+    позже даты окончания, даты меняются местами. Строки без дат
+    в результат не попадают.
+
+    Returns:
+        DataFrame со столбцами:
+            "row" - метка строки из индекса start_dates;
+            "Период" (Period) - период;
+            "Доля" (float) - доля проекта, выполненная в периоде.
+        Строки одного проекта идут подряд в порядке периодов.
+    """
+    start = pd.to_datetime(start_dates).to_numpy(dtype="datetime64[D]")
+    end = pd.to_datetime(end_dates).to_numpy(dtype="datetime64[D]")
+    start, end = np.minimum(start, end), np.maximum(start, end)
+
+    valid = ~np.isnat(start) & ~np.isnat(end)
+    rows = start_dates.index[valid]
+    start, end = start[valid], end[valid]
+
+    first = pd.PeriodIndex(start, freq=freq).asi8
+    last = pd.PeriodIndex(end, freq=freq).asi8
+    counts = last - first + 1
+
+    # номер периода внутри проекта: 0, 1, ..., counts - 1
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    periods = pd.PeriodIndex.from_ordinals(np.repeat(first, counts) + position, freq=freq)
+
+    project_start = np.repeat(start, counts)
+    project_end = np.repeat(end, counts)
+    period_start = periods.start_time.to_numpy(dtype="datetime64[D]")
+    period_end = periods.end_time.to_numpy(dtype="datetime64[D]")
+
+    days = np.minimum(period_end, project_end) - np.maximum(period_start, project_start)
+    total = project_end - project_start
+
+    return DataFrame(
+        {
+            "row": np.repeat(rows, counts),
+            "Период": periods,
+            "Доля": (days.astype(int) + 1) / (total.astype(int) + 1),
+        }
     )
 
-    if row["Дата начала проекта"] > row["Дата окончания проекта"]:
-        row["Дата начала проекта"], row["Дата окончания проекта"] = (
-            row["Дата окончания проекта"],
-            row["Дата начала проекта"],
-        )  # noqa: E501
-
-    try:
-        quarters = pd.period_range(
-            start=row["Дата начала проекта"], end=row["Дата окончания проекта"], freq="Q"
-        )
-    except ValueError:
-        quarters = find_period(row)
-
-    quarter_points = []
-
-    for quarter in quarters:
-        quarter_start = max(pd.Timestamp(quarter.start_time), row["Дата начала проекта"])
-        quarter_end = min(pd.Timestamp(quarter.end_time), row["Дата окончания проекта"])
-        days_in_quarter = (quarter_end - quarter_start).days + 1
-
-        total_days = (row["Дата окончания проекта"] - row["Дата начала проекта"]).days + 1
-
-        proportion = days_in_quarter / total_days
-        points = round(row[colomn] * proportion, 2)
-        quarter_points.append(
-            {"Шифр_ИСП": row["Шифр (ИСП)"], "Квартал": quarter, colomn: points}
-        )
-    return quarter_points
-
 
 def calculate_quarter(df: DataFrame, colomn: str) -> DataFrame:
     """
     Создает таблицу с кварталами и заработанными баллами в каждом квартале.
+
+    Если проект был выполнен в течение одного квартала,
+    все баллы пойдут в этот квартал.
+    Если проект был выполнен в течение нескольких кварталов,
+    то баллы будут распределены по кварталам пропорционально времени,
+    потраченному на проект в каждом квартале.
+    Если дат проекта нет, период берется из шифра ИСП.
+
+    Принимает типизированные данные архива (parse_project_archive).
     """
     logging.info(
         "Распределение заработанных баллов/"
         "суммы заложенного оборудования по кварталам."
     )
-    quarterly_points = df.apply(calculate_quarter_points, axis=1, args=(colomn,))
+    start = df["Дата начала проекта"]
+    end = df["Дата окончания проекта"]
 
-    quarterly_points = [item for sublist in quarterly_points for item in sublist]
+    no_dates = start.isna() | end.isna()
+    cipher_start, cipher_end = dates_from_cipher(df["Шифр (ИСП)"])
+    start = start.mask(no_dates, cipher_start)
+    end = end.mask(no_dates, cipher_end)
 
-    quarterly_df = pd.DataFrame(quarterly_points)
+    shares = split_by_periods(start, end, freq="Q")
+    values = df[colomn].loc[shares["row"]].to_numpy() * shares["Доля"].to_numpy()
+    # встроенный round, как при построчном расчете
+    shares[colomn] = [round(value, 2) for value in values.tolist()]
 
-    result = quarterly_df.groupby("Квартал")[f"{colomn}"].sum().reset_index()
+    result = shares.groupby("Период")[colomn].sum().reset_index()
+    result = result.rename(columns={"Период": "Квартал"})
     result["Квартал"] = result["Квартал"].apply(lambda x: f"{x.quarter}-{x.year}")
 
     return result[result["Квартал"].str.contains(CURRENT_YEAR)]
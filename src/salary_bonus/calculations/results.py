@@ -1,10 +1,10 @@
 import pandas as pd
 from pandas.core.frame import DataFrame
 
-from src.salary_bonus.config.defaults import CURRENT_MONTH, CURRENT_YEAR, MONTHS
+from src.salary_bonus.calculations.utils import match_engineer_names
+from src.salary_bonus.config.defaults import CURRENT_YEAR, MONTHS
 from src.salary_bonus.logger import logging
 from src.salary_bonus.worksheets.worksheets import (
-    get_attendance_sheet_ws,
     send_hours_data_ws,
     send_results_data_ws,
 )
@@ -29,43 +29,50 @@ def count_average_points(res: dict) -> DataFrame:
     return average_df[["Месяц", "Средний балл"]]
 
 
-def get_working_hours_data(engineers: list[str]) -> DataFrame:
-    """Собирает данные о рабочих часах проектировщиков."""
+def get_working_hours_data(
+    engineers: list[str], raw_data: dict[str, list[list[str]]]
+) -> DataFrame:
+    """
+    Собирает данные о рабочих часах проектировщиков из данных
+    табеля посещаемости (название листа -> значения листа).
+    """
     logging.info("Сбор данных о рабочих часах проектировщиков.")
 
-    monthly_data = {}
+    name_col = "Фамилия Имя Отчество "
     months_list = list(MONTHS.values())
-    columns = ["Имя"] + months_list
-    df = pd.DataFrame(columns=columns)
-
-    attendance_ws_all = get_attendance_sheet_ws()
-
-    for num in range(1, CURRENT_MONTH + 1):
-        for worksheet in attendance_ws_all:
-            if worksheet.title == MONTHS[str(num)]:
-                raw_data = worksheet.get("A1:T160")
-                data = pd.DataFrame(raw_data[1:], columns=raw_data[0])
-                monthly_data[MONTHS[str(num)]] = data
 
-    for engineer in engineers:
-        engineer_work = {"Имя": f"{engineer}"}
-        for month_name, data in monthly_data.items():
-            filtered_df = data[
-                data["Фамилия Имя Отчество "].str.contains(f"{engineer}", na=False)
-            ]
-            if not filtered_df.empty:
-                hours = filtered_df["Часы"].values[0]
-                engineer_work[month_name] = hours
-        df = pd.concat([df, pd.DataFrame([engineer_work])], ignore_index=True)
-
-    df.iloc[:, 1:] = df.iloc[:, 1:].apply(pd.to_numeric, errors="coerce")
-
-    df_work_without_nan = df.fillna(0)
+    monthly_data = [
+        pd.DataFrame(values[1:], columns=values[0])[[name_col, "Часы"]].assign(
+            Месяц=month_name
+        )
+        for month_name, values in raw_data.items()
+        if len(values) > 1
+    ]
+
+    hours = pd.DataFrame(columns=["Имя", "Месяц", "Часы"])
+    if monthly_data and engineers:
+        attendance = pd.concat(monthly_data, ignore_index=True)
+        names = match_engineer_names(attendance[name_col], engineers)
+        hours = attendance.loc[names.index].assign(Имя=names)
+        # как и раньше, берем первую найденную строку за месяц
+        hours = hours.drop_duplicates(subset=["Имя", "Месяц"])
+
+    hours["Часы"] = pd.to_numeric(hours["Часы"], errors="coerce")
+
+    df = (
+        hours.pivot(index="Имя", columns="Месяц", values="Часы")
+        .reindex(index=engineers, columns=months_list)
+        .fillna(0)
+        .rename_axis(index="Имя", columns=None)
+        .reset_index()
+    )
 
-    return df_work_without_nan
+    return df
 
 
-def do_results(results: dict, sum_equipment: DataFrame) -> None:
+def do_results(
+    results: dict, sum_equipment: DataFrame, attendance: dict[str, list[list[str]]]
+) -> None:
     # Подсчет и отправка средних баллов
     # average_df = count_average_points(results)
     # res_df = pd.merge(average_df, sum_equipment, on="Месяц", how="outer")
@@ -77,5 +84,5 @@ def do_results(results: dict, sum_equipment: DataFrame) -> None:
 
     # Сбор и отправка рабочих часов
     engineers = list(results.keys())
-    working_hours = get_working_hours_data(engineers)
+    working_hours = get_working_hours_data(engineers, attendance)
     send_hours_data_ws(working_hours)
@@ -1,15 +1,67 @@
+import numpy as np
 import pandas as pd
 
 from src.salary_bonus.calculations.mounth_points import calculate_by_month
 from src.salary_bonus.logger import logging
 
 
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Приводит имена к виду для точного сравнения: нижний регистр,
+    "ё" заменена на "е", лишние пробелы убраны.
+    """
+    return (
+        names.astype("string")
+        .str.lower()
+        .str.replace("ё", "е", regex=False)
+        .str.split()
+        .str.join(" ")
+    )
+
+
+def match_engineer_names(names: pd.Series, engineers: list[str]) -> pd.Series:
+    """
+    Сопоставляет имена из таблицы с проектировщиками.
+
+    Проектировщик совпадает с именем, если после нормализации его имя
+    равно первым словам имени: "Иванов" совпадает с "Иванов И.И."
+    и "Иванов Иван Иванович", но не с "Иванова Анна".
+
+    Returns:
+        pd.Series: индекс - метки совпавших строк names,
+        значения - имя проектировщика.
+    """
+    eng_df = pd.DataFrame({"Имя": engineers})
+    eng_df["key"] = normalize_names(eng_df["Имя"])
+    eng_df["n_words"] = eng_df["key"].str.count(" ") + 1
+
+    words = normalize_names(names).str.split()
+    n_words_in_names = words.str.len()
+    positions = pd.DataFrame({"row": np.arange(len(names))})
+
+    matched = []
+    for n_words, group in eng_df.groupby("n_words"):
+        keys = words.str[:n_words].str.join(" ").where(n_words_in_names >= n_words)
+        matched.append(
+            positions.assign(key=keys.to_numpy()).merge(group[["Имя", "key"]], on="key")
+        )
+
+    if not matched:
+        return pd.Series([], index=names.index[:0], dtype=object, name="Имя")
+
+    result = pd.concat(matched, ignore_index=True).sort_values("row", kind="stable")
+    return pd.Series(
+        result["Имя"].to_numpy(), index=names.index[result["row"]], name="Имя"
+    )
+
+
 def find_sum_equipment(df: pd.DataFrame) -> pd.DataFrame:
     """
     Считает сумму заложенного оборудования по кварталам.
 
     Args:
-        df (pd.DataFrame): датафрейм с архива проектов.
+        df (pd.DataFrame): типизированные данные архива проектов
+            (parse_project_archive).
 
     Returns:
         Структура итогового DataFrame:
@@ -21,8 +73,6 @@ def find_sum_equipment(df: pd.DataFrame) -> pd.DataFrame:
     """
     logging.info("Начинаем подсчет суммы заложенного оборудования по кварталам.")
     name = "Сумма заложенного оборудования"
-    df[name] = df[name].str.replace("\xa0", "").str.replace(",", ".")
-    df[name] = pd.to_numeric(df[name], errors="coerce")
 
     equipment_df = df[
         [
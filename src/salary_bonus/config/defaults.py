@@ -42,9 +42,21 @@ ADD_WORK_COL_NAMES = [
     "Дедлайн",
 ]
 
-# sleep time in seconds
-AFTER_FORMAT_SLEEP = 5
-AFTER_ENG_SLEEP = 10
+# Google Sheets API quotas (requests per minute per user)
+READ_REQUESTS_PER_MINUTE = 60
+WRITE_REQUESTS_PER_MINUTE = 60
+REQUESTS_BURST = 10
+
+# threads for blocking Google Sheets requests made from async code
+SHEETS_IO_THREADS = 4
+# engineers whose sheets are prepared at the same time
+ENGINEER_CONCURRENCY = 4
+
+# retries of failed Google API requests (429/5xx)
+RETRY_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 64
+RETRY_BUDGET = 50
 
 # worksheet/spreadsheet names
 PROJECT_ARCHIVE = "Таблица проектов"
@@ -10,6 +10,9 @@ load_dotenv(dotenv_path=env_path)
 # credentials
 CREDS_PATH = os.path.join(BASE_DIR, "creds.json")
 
+# снимки архивов проектов
+SNAPSHOT_DIR = os.path.join(BASE_DIR, ".snapshots")
+
 # worksheets
 EMAILS = os.getenv("EMAILS")
 ENDPOINT_ATTENDANCE_SHEET = os.getenv("ENDPOINT_ATTENDANCE_SHEET")
@@ -25,18 +25,25 @@ from src.salary_bonus.calculations.results import do_results
 from src.salary_bonus.calculations.utils import find_sum_equipment
 from src.salary_bonus.logger import logging
 from src.salary_bonus.notification.telegram.bot import TelegramNotifier
-from src.salary_bonus.utils import (
-    get_employees,
-    get_project_archive_data,
-    sum_points_by_month,
-)
+from src.salary_bonus.utils import prefetch_sources, prefetched, sum_points_by_month
 from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
-from src.salary_bonus.worksheets.worksheets import send_month_data_to_spreadsheet
+from src.salary_bonus.worksheets.worksheets import (
+    discard_write_plans,
+    flush_write_plans,
+    send_month_data_to_spreadsheet,
+)
 
 pd.options.mode.chained_assignment = None
 pd.set_option("future.no_silent_downcasting", True)
 
 
+def send_month_data_to_engineer(
+    engineer: str, month_data: dict[str, pd.DataFrame]
+) -> None:
+    """Добавляет баллы по месяцам в план записи листа проектировщика."""
+    send_month_data_to_spreadsheet(month_data[engineer], engineer)
+
+
 async def main() -> None:
     """
     Запускает и завершает работу программы.
@@ -45,7 +52,9 @@ async def main() -> None:
     tg_bot = TelegramNotifier()
 
     try:
-        employees_data = get_employees()
+        # все исходные данные загружаются одновременно
+        sources = await prefetch_sources()
+        employees_data = prefetched(sources, "employees")
         list_of_engineers = employees_data["engineers"]
         # list_of_engineers = ["Цуканов"]
 
@@ -61,31 +70,47 @@ async def main() -> None:
             return
 
         # Расчет баллов по основным проектам для проектировщиков
-        main_archive_df = get_project_archive_data()
-        archive_points, eng_data = await process_project_archive_data(
-            main_archive_df, list_of_engineers, tg_bot
+        main_archive_df = prefetched(sources, "project_archive")
+        archive_points, eng_data, archive = await process_project_archive_data(
+            main_archive_df, list_of_engineers, tg_bot, prefetched(sources, "corrections")
         )
 
         # Рассчет баллов по дополнительным проектам для проектировщиков
         add_data_points = await process_additional_work_data(
-            list_of_engineers, tg_bot, eng_data
+            prefetched(sources, "add_work"), list_of_engineers, tg_bot, eng_data
         )
 
         # Суммируем результаты из двух источников и отправляем в таблицы
-        month_res_data = sum_points_by_month(archive_points, add_data_points)
-        for engineer, df in month_res_data.items():
-            send_month_data_to_spreadsheet(df, engineer)
+        month_res_data = sum_points_by_month(archive_points, add_data_points, split=True)
+        await sheets_manager.run_for_each(
+            send_month_data_to_engineer, list(month_res_data), month_res_data
+        )
+        await flush_write_plans()
 
         # Считаем сумму залож. оборудования и часы работы и отправляем на лист "Итоги"
-        sum_equipment = find_sum_equipment(main_archive_df)
-        do_results(month_res_data, sum_equipment)
+        sum_equipment = find_sum_equipment(archive)
+        await sheets_manager.run(
+            do_results, month_res_data, sum_equipment, prefetched(sources, "attendance")
+        )
 
         # Рассчет баллов для руководителей и гипа
-        process_lead_data(month_res_data, employees_data["lead"], employees_data["chief"])
+        await sheets_manager.run(
+            process_lead_data,
+            month_res_data,
+            employees_data["lead"],
+            employees_data["chief"],
+        )
+        await flush_write_plans()
 
         await tg_bot.send_message("Расчет баллов успешно закончен.")
     except Exception as error:
         logging.exception(error)
+        # данные, подготовленные до ошибки, все равно записываются на листы,
+        # как при записи по мере расчета; не отправленные планы сбрасываются
+        try:
+            await flush_write_plans()
+        except Exception as flush_error:
+            logging.exception(flush_error)
         error_name = type(error).__name__
         tb = "".join(traceback.format_tb(error.__traceback__))
 
@@ -93,6 +118,8 @@ async def main() -> None:
             f"Во время расчета произошла ошибка {error_name}: {error}\n\n" f"{tb}"
         )
     finally:
+        discard_write_plans()
+        sheets_manager.finish_run()
         sheets_manager.invalidate()
         await tg_bot.close()
 
@@ -102,8 +129,11 @@ async def update_holidays_package():
     Обновляет пакет holidays для подгрузки данных о выходных в новых годах.
     """
     tg_bot = TelegramNotifier()
+    command = ["pip", "install", "--upgrade", "holidays"]
     try:
-        subprocess.run(["pip", "install", "--upgrade", "holidays"], check=True)
+        process = await asyncio.create_subprocess_exec(*command)
+        if await process.wait():
+            raise subprocess.CalledProcessError(process.returncode, command)
         logging.info("Библиотека holidays была обновлена.")
     except subprocess.CalledProcessError as error:
         logging.exception(f"Библиотека holidays не обновлена: {error}")
@@ -1,16 +1,27 @@
+import asyncio
 from datetime import datetime as dt
-from datetime import timedelta
+from typing import Any
 
 import gspread
-import holidays
 import pandas as pd
 from pandas.core.frame import DataFrame
 
-from src.salary_bonus.config.defaults import ADDITIONAL_WORK, PROJECT_ARCHIVE
+from src.salary_bonus.calculations import business_days
+from src.salary_bonus.calculations.mounth_points import split_by
+from src.salary_bonus.config.defaults import (
+    ADDITIONAL_WORK,
+    CURRENT_MONTH,
+    MONTHS,
+    PROJECT_ARCHIVE,
+)
 from src.salary_bonus.logger import logging
+from src.salary_bonus.worksheets.archive_cache import cached_records
+from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
 from src.salary_bonus.worksheets.worksheets import (
     connect_to_archive,
     connect_to_settings_ws,
+    get_attendance_months_data,
+    get_engineers_ws_data,
 )
 
 pd.options.mode.chained_assignment = None
@@ -27,7 +38,7 @@ def get_project_archive_data() -> DataFrame | None:
         logging.exception(err)
         return None
 
-    df = pd.DataFrame(worksheet.get_all_records(numericise_ignore=["all"]))
+    df = cached_records(worksheet)
 
     return df
 
@@ -43,7 +54,7 @@ def get_add_work_data() -> DataFrame | None:
         logging.exception(err)
         return None
 
-    df = pd.DataFrame(worksheet.get_all_records(numericise_ignore=["all"]))
+    df = cached_records(worksheet)
 
     return df
 
@@ -96,34 +107,103 @@ def get_employees() -> dict[str, list[str] | dict[str, list[str]]]:
     return result
 
 
-def is_point(s: str) -> bool:
+def get_attendance_data() -> dict[str, list[list[str]]]:
     """
-    Проверка столбца "Баллы".
-    Если значение состоит из строки, в котрой только число, возвращает True.
+    Получает данные табеля посещаемости за месяцы текущего года
+    по текущий месяц включительно.
     """
-    try:
-        float(s)
-        return True
-    except ValueError:
-        return False
+    return get_attendance_months_data(
+        [MONTHS[str(num)] for num in range(1, CURRENT_MONTH + 1)]
+    )
 
 
-def count_non_working_days(start_date: dt.date, end_date: dt.date) -> int:
-    """Считает количество нерабочих дней в заданном промежутке."""
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
+def get_complexity_corrections(engineers: list[str]) -> dict[str, pd.Series]:
+    """
+    Берёт данные о корректировке сложности с листов проектировщиков
+    одним запросом. Значения идут в порядке проектов на листе проектировщика.
+    Проектировщики без листа или без корректировок в результат не попадают.
+    """
+    raw_data = get_engineers_ws_data(engineers, "J1:J200")
 
-    ru_holidays = holidays.RU(years=range(start_date.year, end_date.year + 1))
+    corrections = {}
+    for engineer, values in raw_data.items():
+        try:
+            new_coplexity = pd.DataFrame(values[1:], columns=values[0])
+        except (IndexError, ValueError):
+            continue
+
+        if not new_coplexity.empty:
+            corrections[engineer] = new_coplexity["Корректировка сложности"]
+
+    return corrections
 
-    non_working_days = 0
 
-    current_date = start_date
-    while current_date <= end_date:
-        if current_date.weekday() >= 5 or current_date in ru_holidays:
-            non_working_days += 1
-        current_date += timedelta(days=1)
+async def prefetch_sources() -> dict[str, Any]:
+    """
+    Загружает все независимые источники данных в начале запуска.
+    Чтения выполняются одновременно в пуле потоков sheets_manager,
+    поэтому загрузка занимает столько же времени, сколько самое долгое
+    чтение, а не сумму всех чтений.
+
+    Returns:
+        dict: {"employees": данные листа 'Настройки' (см. get_employees),
+               "project_archive": DataFrame | None - архив проектов,
+               "add_work": DataFrame | None - архив доп. работ,
+               "attendance": dict[str, list[list[str]]] - табель посещаемости,
+               "corrections": dict[str, Series] - корректировки сложности
+                   с листов проектировщиков (см. get_complexity_corrections)
+               }
+        Корректировки читаются сразу после получения списка проектировщиков,
+        одновременно с остальными чтениями.
+        Если чтение источника завершилось ошибкой, она логируется
+        и сохраняется вместо данных: остальные источники загружаются
+        до конца, а ошибку поднимает этап, которому нужен этот источник
+        (см. prefetched).
+    """
+    logging.info("Загрузка исходных данных.")
+    sources = {
+        "employees": get_employees,
+        "project_archive": get_project_archive_data,
+        "add_work": get_add_work_data,
+        "attendance": get_attendance_data,
+    }
+    tasks = {
+        name: asyncio.ensure_future(sheets_manager.run(get))
+        for name, get in sources.items()
+    }
+
+    async def read_corrections() -> dict[str, pd.Series]:
+        engineers = (await tasks["employees"])["engineers"]
+        return await sheets_manager.run(get_complexity_corrections, engineers)
+
+    tasks["corrections"] = asyncio.ensure_future(read_corrections())
+    data = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    for name, result in zip(tasks, data):
+        if isinstance(result, BaseException):
+            logging.error(
+                f'Не удалось загрузить источник "{name}": {result!r}', exc_info=result
+            )
+    return dict(zip(tasks, data))
+
+
+def prefetched(sources: dict[str, Any], name: str) -> Any:
+    """
+    Возвращает данные источника, загруженные prefetch_sources,
+    или поднимает ошибку, с которой завершилась их загрузка.
+    """
+    data = sources[name]
+    if isinstance(data, BaseException):
+        raise data
+    return data
+
 
-    return non_working_days
+def count_non_working_days(start_date: dt.date, end_date: dt.date) -> int:
+    """Считает количество нерабочих дней в заданном промежутке."""
+    non_working_days = business_days.count_non_working_days(
+        pd.Series([start_date]), pd.Series([end_date])
+    )
+    return int(non_working_days.iloc[0])
 
 
 def define_integer(integer: str) -> float | int:
@@ -149,43 +229,48 @@ def sum_points_by_month(
     d2: dict[str, DataFrame],
     month_col: str = "Месяц",
     points_col: str = "Баллы",
-) -> dict[str, DataFrame]:
+    by: str = "Проектировщик",
+    split: bool = False,
+) -> DataFrame | dict[str, DataFrame]:
     """
-    Суммирует баллы по месяцам для каждого проектировщика из двух словарей.
+    Суммирует баллы по месяцам для всех проектировщиков из двух словарей
+    одной группировкой по длинной таблице.
 
     Ожидается, что в df есть колонки:
-      - month_col: pandas.Period('YYYY-MM', freq='M') или строка вида 'YYYY-MM'
+      - month_col: строка вида 'MM-YYYY'
       - points_col: float
 
-    Возвращает словарь engineer -> df с колонками [month_col, points_col],
-    где points_col — сумма из обоих источников по каждому месяцу.
+    Возвращает DataFrame с колонками [by, month_col, points_col], где
+    points_col — сумма из обоих источников по каждому месяцу.
+    Если split=True, возвращает словарь engineer -> df с колонками
+    [month_col, points_col] для каждого проектировщика из обоих словарей
+    (пустой df, если данных нет).
     """
-    result: dict[str, DataFrame] = {}
-
-    all_engineers = set(d1) | set(d2)
-
-    for eng in all_engineers:
-        frames: list[DataFrame] = []
-        if eng in d1 and d1[eng] is not None and not d1[eng].empty:
-            frames.append(d1[eng][[month_col, points_col]].copy())
-        if eng in d2 and d2[eng] is not None and not d2[eng].empty:
-            frames.append(d2[eng][[month_col, points_col]].copy())
-
-        if not frames:
-            result[eng] = pd.DataFrame(columns=[month_col, points_col])
-            continue
-
-        df = pd.concat(frames, ignore_index=True)
-
-        df[points_col] = pd.to_numeric(df[points_col], errors="coerce").fillna(0.0)
-
+    engineers = list(dict.fromkeys([*d1, *d2]))
+    frames = [
+        (eng, df[[month_col, points_col]])
+        for points in (d1, d2)
+        for eng, df in points.items()
+        if df is not None and not df.empty
+    ]
+
+    if frames:
+        keys, values = zip(*frames)
+        long_df = pd.concat(values, keys=keys, names=[by, None])
         summed = (
-            df.groupby(month_col, as_index=False)[points_col]
+            long_df.astype({points_col: float})
+            .groupby([by, month_col])[points_col]
             .sum()
-            .sort_values(month_col)
-            .reset_index(drop=True)
+            .reset_index()
         )
+    else:
+        summed = pd.DataFrame(columns=[by, month_col, points_col])
 
-        result[eng] = summed
+    if not split:
+        return summed
 
-    return result
+    result = split_by(summed, by)
+    return {
+        eng: result.get(eng, pd.DataFrame(columns=[month_col, points_col]))
+        for eng in engineers
+    }
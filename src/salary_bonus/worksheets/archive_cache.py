@@ -0,0 +1,91 @@
+import glob
+import os
+
+import pandas as pd
+from gspread.worksheet import Worksheet
+from pandas.core.frame import DataFrame
+
+from src.salary_bonus.config.environment import SNAPSHOT_DIR
+from src.salary_bonus.logger import logging
+
+try:
+    import pyarrow  # noqa: F401
+
+    SNAPSHOT_EXT = "parquet"
+except ImportError:
+    SNAPSHOT_EXT = "pkl"
+
+
+def snapshot_prefix(worksheet: Worksheet) -> str:
+    """Общая часть имени снимков листа: id таблицы и id листа."""
+    return os.path.join(SNAPSHOT_DIR, f"{worksheet.spreadsheet_id}_{worksheet.id}")
+
+
+def snapshot_path(worksheet: Worksheet, modified_time: str) -> str:
+    """
+    Файл снимка листа для версии таблицы modified_time
+    (modifiedTime таблицы в Google Drive).
+    """
+    version = modified_time.replace(":", "-").replace(".", "-")
+    return f"{snapshot_prefix(worksheet)}_{version}.{SNAPSHOT_EXT}"
+
+
+def read_snapshot(path: str) -> DataFrame:
+    if SNAPSHOT_EXT == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def save_snapshot(df: DataFrame, worksheet: Worksheet, path: str) -> None:
+    """
+    Сохраняет снимок листа и удаляет снимки его прошлых версий.
+    Ошибки записи и удаления не прерывают расчет.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        if SNAPSHOT_EXT == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError) as err:
+        logging.warning(f'Не удалось сохранить снимок листа "{worksheet.title}": {err}')
+        return
+
+    for old_path in glob.glob(f"{snapshot_prefix(worksheet)}_*"):
+        if old_path == path:
+            continue
+        try:
+            os.remove(old_path)
+        except OSError as err:
+            logging.warning(f'Не удалось удалить старый снимок "{old_path}": {err}')
+
+
+def cached_records(worksheet: Worksheet) -> DataFrame:
+    """
+    Возвращает все записи листа (значения - строки).
+
+    Перед загрузкой запрашивается время изменения таблицы в Google Drive.
+    Если таблица не менялась с прошлой загрузки, записи читаются
+    из снимка на диске, иначе лист загружается целиком и снимок
+    обновляется.
+    """
+    # время изменения берется до загрузки: если таблицу изменят во время
+    # загрузки, в следующий раз время не совпадет и лист загрузится заново
+    modified_time = worksheet.spreadsheet.get_lastUpdateTime()
+    path = snapshot_path(worksheet, modified_time)
+
+    if os.path.exists(path):
+        try:
+            df = read_snapshot(path)
+            logging.info(f'Лист "{worksheet.title}" не менялся, данные взяты из снимка.')
+            return df
+        except Exception as err:
+            logging.warning(
+                f'Не удалось прочитать снимок листа "{worksheet.title}": {err}'
+            )
+
+    df = pd.DataFrame(worksheet.get_all_records(numericise_ignore=["all"]))
+    save_snapshot(df, worksheet, path)
+    return df
@@ -1,13 +1,31 @@
-import time
-from typing import Callable, Dict, Tuple
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable
 
 import gspread
 from gspread.spreadsheet import Spreadsheet
 from gspread.worksheet import Worksheet
 
-from src.salary_bonus.config.defaults import COLOMNS_COUNT, ROWS_COUNT
+from src.salary_bonus.config.defaults import (
+    COLOMNS_COUNT,
+    ENGINEER_CONCURRENCY,
+    READ_REQUESTS_PER_MINUTE,
+    REQUESTS_BURST,
+    RETRY_BASE_DELAY,
+    RETRY_BUDGET,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+    ROWS_COUNT,
+    SHEETS_IO_THREADS,
+    WRITE_REQUESTS_PER_MINUTE,
+)
 from src.salary_bonus.config.environment import CREDS_PATH
 from src.salary_bonus.logger import logging
+from src.salary_bonus.worksheets.rate_limiter import RequestScheduler
+from src.salary_bonus.worksheets.retry import RetryPolicy, is_idempotent
+from src.salary_bonus.worksheets.snapshot import sheet_snapshots
 
 gc = gspread.service_account(filename=CREDS_PATH)
 
@@ -32,109 +50,197 @@ class GoogleSheetsManager:
             Значение:
                 gspread.Spreadsheet - объект открытой таблицы.
 
-        self._worksheets: Dict[Tuple[str, str], Worksheet]
-            Кеш открытых листов таблиц.
+        self._worksheets: Dict[str, Dict[str, Worksheet]]
+            Индекс листов таблиц, загруженный одним запросом метаданных
+            (fetch_sheet_metadata) на таблицу за запуск.
 
             Ключ:
-                Tuple[str, str] - (spreadsheet_id, worksheet_title),
-                где:
-                    spreadsheet_id - уникальный идентификатор таблицы,
-                    worksheet_title - название листа внутри таблицы.
+                str - spreadsheet_id, уникальный идентификатор таблицы.
             Значение:
-                gspread.Worksheet - объект листа Google Sheets.
+                Dict[str, Worksheet] - все листы таблицы по названию.
+
+        self.scheduler: RequestScheduler
+            Планировщик запросов, через который проходят все запросы клиента.
+
+        self.retry_policy: RetryPolicy
+            Политика повторов запросов при ошибках 429 и 5xx.
+
+        self.executor: ThreadPoolExecutor
+            Пул потоков для блокирующих запросов gspread из асинхронного кода.
+
+        self._lock: threading.Lock
+            Блокировка словарей кеша и self._loading.
+
+        self._loading: Dict[Hashable, threading.RLock]
+            Блокировки загрузки по ключу (таблица, индекс листов, лист):
+            потоки пула не открывают одну таблицу и не загружают одни
+            метаданные дважды, а разные таблицы открываются одновременно.
         """
         self.client: gspread.Client = g_client
         self._spreadsheets: Dict[str, Spreadsheet] = {}
-        self._worksheets: Dict[Tuple[str, str], Worksheet] = {}
+        self._worksheets: Dict[str, Dict[str, Worksheet]] = {}
+        self.scheduler = RequestScheduler(
+            READ_REQUESTS_PER_MINUTE, WRITE_REQUESTS_PER_MINUTE, REQUESTS_BURST
+        )
+        self.retry_policy = RetryPolicy(
+            RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_BUDGET
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=SHEETS_IO_THREADS, thread_name_prefix="sheets"
+        )
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.RLock] = {}
+        self._schedule_requests()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Выполняет блокирующую операцию с Google Sheets в пуле потоков.
+        Запросы gspread, ожидание квоты и задержки перед повторами
+        идут в потоке пула, поэтому цикл событий не блокируется.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def run_for_each(
+        self,
+        func: Callable[..., Any],
+        items: list[Hashable],
+        *args,
+        limit: int = ENGINEER_CONCURRENCY,
+    ) -> dict[Hashable, Any]:
+        """
+        Выполняет func(item, *args) для каждого элемента в пуле потоков,
+        не больше limit одновременно. Все запросы проходят через общий
+        планировщик квот клиента.
+
+        Результаты возвращаются словарем item -> результат в порядке items,
+        независимо от порядка завершения. Если какой-то вызов завершился
+        ошибкой, она поднимается после завершения остальных вызовов.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run_one(item: Hashable) -> Any:
+            async with semaphore:
+                return await self.run(func, item, *args)
+
+        results = await asyncio.gather(
+            *(run_one(item) for item in items), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(items, results))
+
+    def _schedule_requests(self) -> None:
+        """
+        Пропускает все HTTP-запросы клиента через планировщик запросов,
+        чтобы ждать только при исчерпании квоты Google API,
+        и повторяет запросы, завершившиеся временной ошибкой.
+        Создание таблиц и листов повторяется только после ошибки 429.
+        """
+        http_client = self.client.http_client
+        request = http_client.request
+
+        def scheduled_request(method: str, endpoint: str, *args, **kwargs):
+            def send():
+                self.scheduler.acquire(method)
+                return request(method, endpoint, *args, **kwargs)
+
+            idempotent = is_idempotent(method, endpoint, kwargs.get("json"))
+            return self.retry_policy.call(send, idempotent)
+
+        http_client.request = scheduled_request
+
+    def finish_run(self) -> None:
+        """
+        Логирует статистику повторов запросов за запуск
+        и восстанавливает бюджет повторов для следующего запуска.
+        """
+        logging.info(self.retry_policy.summary())
+        self.retry_policy.reset()
+
+    def _loading_lock(self, key: Hashable) -> threading.RLock:
+        """Блокировка загрузки объекта кеша с ключом key."""
+        with self._lock:
+            return self._loading.setdefault(key, threading.RLock())
 
     def get_spreadsheet(self, title: str) -> Spreadsheet:
-        logging.info(f'Открытие таблицы "{title}"')
-        if title not in self._spreadsheets:
-            try:
-                self._spreadsheets[title] = self.client.open(title)
-            except gspread.exceptions.SpreadsheetNotFound:
-                logging.info(
-                    f'Таблица "{title}" не найдена, или у бота нет доступа к ней'
-                )
-                raise
-        return self._spreadsheets[title]
+        with self._loading_lock(title):
+            logging.info(f'Открытие таблицы "{title}"')
+            if title not in self._spreadsheets:
+                try:
+                    self._spreadsheets[title] = self.client.open(title)
+                except gspread.exceptions.SpreadsheetNotFound:
+                    logging.info(
+                        f'Таблица "{title}" не найдена, или у бота нет доступа к ней'
+                    )
+                    raise
+            return self._spreadsheets[title]
 
     def get_spreadsheet_by_url(self, url: str) -> Spreadsheet:
-        if url not in self._spreadsheets:
-            logging.info(f"Открытие таблицы по URL: {url}")
-            try:
-                self._spreadsheets[url] = self.client.open_by_url(url)
-            except gspread.exceptions.SpreadsheetNotFound as err:
-                logging.exception(
-                    f"Таблица по ссылке {url} не найдена, "
-                    f"или у бота нет доступа к ней: {err}"
-                )
-                raise
-        return self._spreadsheets[url]
+        with self._loading_lock(url):
+            if url not in self._spreadsheets:
+                logging.info(f"Открытие таблицы по URL: {url}")
+                try:
+                    self._spreadsheets[url] = self.client.open_by_url(url)
+                except gspread.exceptions.SpreadsheetNotFound as err:
+                    logging.exception(
+                        f"Таблица по ссылке {url} не найдена, "
+                        f"или у бота нет доступа к ней: {err}"
+                    )
+                    raise
+            return self._spreadsheets[url]
+
+    def _worksheet_index(self, spreadsheet: Spreadsheet) -> Dict[str, Worksheet]:
+        """
+        Возвращает индекс листов таблицы по названию.
+        При первом обращении загружает метаданные всей таблицы одним запросом.
+        """
+        with self._loading_lock(spreadsheet.id):
+            if spreadsheet.id not in self._worksheets:
+                logging.info(f'Загрузка списка листов таблицы "{spreadsheet.title}".')
+                self._worksheets[spreadsheet.id] = {
+                    ws.title: ws for ws in spreadsheet.worksheets()
+                }
+            return self._worksheets[spreadsheet.id]
 
     def get_worksheet(
         self,
         spreadsheet: Spreadsheet,
         title: str,
     ) -> Worksheet | None:
-        key = (spreadsheet.id, title)
-        if key in self._worksheets:
-            return self._worksheets[key]
-
-        try:
-            ws = spreadsheet.worksheet(title)
-            self._worksheets[key] = ws
-            return ws
-        except gspread.exceptions.WorksheetNotFound:
+        ws = self._worksheet_index(spreadsheet).get(title)
+        if ws is None:
             logging.info(f'Лист "{title}" не найден.')
-            return None
+        return ws
 
     def get_all_worksheets(
         self,
         spreadsheet: Spreadsheet,
     ) -> list[Worksheet]:
         """Возвращает список всех листов (Worksheet) указанной таблицы."""
-        cached_ws = [
-            ws
-            for (spreadsheet_id, _), ws in self._worksheets.items()
-            if spreadsheet_id == spreadsheet.id
-        ]
-
-        if cached_ws:
-            return cached_ws
-
-        worksheets = spreadsheet.worksheets()
-
-        for ws in worksheets:
-            key = (spreadsheet.id, ws.title)
-            self._worksheets[key] = ws
-
-        return worksheets
+        return list(self._worksheet_index(spreadsheet).values())
 
     def get_or_create_spreadsheet(
         self,
         title: str,
         formatter: Callable[[Spreadsheet], None] | None = None,
-        sleep_after: int = 0,
     ) -> Worksheet:
-        try:
-            spreadsheet = self.get_spreadsheet(title)
-            return spreadsheet
-        except gspread.exceptions.SpreadsheetNotFound:
-            pass
-
-        logging.info(f'Таблица "{title}" не найдена. ' f"Создание новой таблицы.")
-        spreadsheet = gc.create(title)
+        with self._loading_lock(title):
+            try:
+                spreadsheet = self.get_spreadsheet(title)
+                return spreadsheet
+            except gspread.exceptions.SpreadsheetNotFound:
+                pass
 
-        if formatter:
-            formatter(spreadsheet)
+            logging.info(f'Таблица "{title}" не найдена. ' f"Создание новой таблицы.")
+            spreadsheet = self.client.create(title)
 
-        if sleep_after:
-            logging.info(f"Ждем {sleep_after} секунд для продолжения работы")
-            time.sleep(sleep_after)
+            if formatter:
+                formatter(spreadsheet)
 
-        self._spreadsheets[title] = spreadsheet
-        return spreadsheet
+            self._spreadsheets[title] = spreadsheet
+            return spreadsheet
 
     def get_or_create_worksheet(
         self,
@@ -143,32 +249,44 @@ class GoogleSheetsManager:
         rows: int = ROWS_COUNT,
         cols: int = COLOMNS_COUNT,
         formatter: Callable[[Worksheet], None] | None = None,
-        sleep_after: int = 0,
     ) -> Worksheet:
-        ws = self.get_worksheet(spreadsheet, title)
-        if ws:
-            return ws
+        with self._loading_lock((spreadsheet.id, title)):
+            ws = self.get_worksheet(spreadsheet, title)
+            if ws:
+                return ws
 
-        logging.info(f'Создание листа "{title}".')
-        ws = spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+            logging.info(f'Создание листа "{title}".')
+            ws = spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
 
-        if formatter:
-            formatter(ws)
-        logging.info(f'Лист "{title}" создан.')
+            if formatter:
+                formatter(ws)
+            logging.info(f'Лист "{title}" создан.')
 
-        if sleep_after:
-            logging.info(f"Ждем {sleep_after} секунд для продолжения работы")
-            time.sleep(sleep_after)
+            self._worksheet_index(spreadsheet)[title] = ws
+            return ws
 
-        self._worksheets[(spreadsheet.id, title)] = ws
-        return ws
+    def del_worksheet(self, spreadsheet: Spreadsheet, title: str) -> None:
+        """
+        Удаляет лист таблицы, если он есть, вместе со снимком
+        записанных на него данных.
+        """
+        with self._loading_lock((spreadsheet.id, title)):
+            ws = self.get_worksheet(spreadsheet, title)
+            if ws is None:
+                return
+
+            spreadsheet.del_worksheet(ws)
+            logging.info(f'Удаление листа "{title}"')
+            self._worksheet_index(spreadsheet).pop(title, None)
+            sheet_snapshots.discard((spreadsheet.id, ws.id))
 
     def invalidate(self) -> None:
         """
         Сброс всего кеша.
         """
-        self._spreadsheets.clear()
-        self._worksheets.clear()
+        with self._lock:
+            self._spreadsheets.clear()
+            self._worksheets.clear()
 
     def invalidate_spreadsheet(self, spreadsheet: Spreadsheet | str) -> None:
         """
@@ -177,19 +295,18 @@ class GoogleSheetsManager:
         Args:
             spreadsheet: gspread.Spreadsheet или spreadsheet_id (str).
         """
-        spreadsheet_id = spreadsheet if isinstance(spreadsheet, str) else spreadsheet.id
+        with self._lock:
+            spreadsheet_id = (
+                spreadsheet if isinstance(spreadsheet, str) else spreadsheet.id
+            )
 
-        self._spreadsheets = {
-            key: value
-            for key, value in self._spreadsheets.items()
-            if value.id != spreadsheet_id
-        }
+            self._spreadsheets = {
+                key: value
+                for key, value in self._spreadsheets.items()
+                if value.id != spreadsheet_id
+            }
 
-        self._worksheets = {
-            key: value
-            for key, value in self._worksheets.items()
-            if key[0] != spreadsheet_id
-        }
+            self._worksheets.pop(spreadsheet_id, None)
 
     def invalidate_worksheet(
         self,
@@ -198,14 +315,20 @@ class GoogleSheetsManager:
     ) -> None:
         """
         Инвалидирует кеш конкретного листа таблицы.
+        Индекс листов таблицы сбрасывается целиком, чтобы следующее
+        обращение загрузило актуальные метаданные, а не частичный список.
         """
-        spreadsheet_id = spreadsheet if isinstance(spreadsheet, str) else spreadsheet.id
+        with self._lock:
+            spreadsheet_id = (
+                spreadsheet if isinstance(spreadsheet, str) else spreadsheet.id
+            )
 
-        self._worksheets.pop((spreadsheet_id, worksheet_title), None)
+            logging.info(f'Сброс кеша листа "{worksheet_title}".')
+            self._worksheets.pop(spreadsheet_id, None)
 
     def del_spreadsheet(self, title: str) -> None:
         """
-        Удаление таблицы.
+        Удаление таблицы и снимков ее листов.
         """
         spreadsheet = self.get_spreadsheet(title)
         spreadsheet_id = spreadsheet.id
@@ -213,6 +336,7 @@ class GoogleSheetsManager:
         self.client.del_spreadsheet(spreadsheet_id)
         logging.info(f"Удаление таблицы '{title}'")
         self.invalidate_spreadsheet(spreadsheet_id)
+        sheet_snapshots.discard_spreadsheet(spreadsheet_id)
 
 
 sheets_manager = GoogleSheetsManager(gc)
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Callable
+
+from src.salary_bonus.logger import logging
+
+
+class TokenBucket:
+    """
+    Ведро токенов для ограничения частоты запросов.
+
+    В ведре помещается не больше capacity токенов, каждый запрос забирает
+    один токен, токены восполняются со скоростью refill_rate в секунду.
+    Если токенов нет, запрос резервирует токен "в долг" и ждёт, пока он
+    восполнится, поэтому одновременные запросы из разных потоков
+    встают в очередь, а не проходят все сразу.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Инициализация TokenBucket.
+
+        Args:
+            capacity (float): максимальное количество токенов
+            refill_rate (float): количество токенов, восполняемых за секунду
+            clock (Callable[[], float]): источник текущего времени в секундах
+            sleep (Callable[[float], None]): функция ожидания
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Забирает один токен, при необходимости дожидаясь его появления.
+        Возвращает время ожидания в секундах.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.refill_rate
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class RequestScheduler:
+    """
+    Планировщик запросов к Google API с учетом поминутных квот
+    на чтение и запись.
+
+    Квоты Sheets API считаются за минуту, а ведро токенов допускает
+    всплеск размером burst. Чтобы всплеск вместе с восполнением
+    не превышал квоту за любую минуту, скорость восполнения
+    равна (квота - burst) запросов в минуту.
+    """
+
+    def __init__(
+        self,
+        reads_per_minute: int,
+        writes_per_minute: int,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.read_bucket = TokenBucket(
+            burst, (reads_per_minute - burst) / 60, clock=clock, sleep=sleep
+        )
+        self.write_bucket = TokenBucket(
+            burst, (writes_per_minute - burst) / 60, clock=clock, sleep=sleep
+        )
+        self.waited = 0.0
+        # запросы идут из нескольких потоков пула
+        self._lock = threading.Lock()
+
+    def acquire(self, method: str) -> None:
+        """
+        Дожидается разрешения на запрос.
+        GET-запросы считаются чтением, остальные - записью.
+        """
+        bucket = self.read_bucket if method.upper() == "GET" else self.write_bucket
+        wait = bucket.acquire()
+
+        if wait:
+            with self._lock:
+                self.waited += wait
+            logging.debug(f"Исчерпана квота запросов к Google API, ждем {wait:.1f} с.")
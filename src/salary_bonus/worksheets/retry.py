@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping
+
+from gspread.exceptions import APIError
+
+from src.salary_bonus.exceptions import TooManyRequestsApiError
+from src.salary_bonus.logger import logging
+
+
+def retry_after_seconds(error: APIError) -> float | None:
+    """
+    Возвращает задержку из заголовка Retry-After ответа Google API
+    или None, если заголовка нет или его не удалось разобрать.
+    """
+    value = error.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def is_idempotent(
+    method: str, endpoint: str, json: Mapping[str, Any] | None = None
+) -> bool:
+    """
+    Повтор запроса не меняет результат: чтение, запись и очистка значений,
+    форматирование. Создание таблиц, листов и копий листов, а также
+    добавление строк (POST) при повторе выполнятся дважды.
+    """
+    if method.upper() != "POST":
+        return True
+    if "/values" in endpoint:
+        return not endpoint.endswith(":append")
+    if endpoint.endswith(":batchUpdate"):
+        requests = (json or {}).get("requests", [])
+        return not any(
+            name.startswith(("add", "duplicate"))
+            for request in requests
+            for name in request
+        )
+    return False
+
+
+class RetryPolicy:
+    """
+    Политика повторов запросов к Google API.
+
+    Повторяет запросы, завершившиеся ошибкой 408, 429 или 5xx,
+    с экспоненциальной задержкой со случайным разбросом (full jitter).
+    Неидемпотентные запросы повторяются только после ошибки 429:
+    такой запрос Google API не выполнял.
+    Если Google API прислал заголовок Retry-After, ждет указанное время,
+    а если оно больше максимальной задержки, запрос не повторяется.
+    Общее число повторов за запуск ограничено бюджетом, чтобы
+    недоступность API не растягивала расчет бесконечно.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        budget: int,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Инициализация RetryPolicy.
+
+        Args:
+            max_attempts (int): максимальное число попыток одного запроса
+            base_delay (float): базовая задержка перед повтором в секундах
+            max_delay (float): максимальная задержка перед повтором в секундах
+            budget (int): максимальное число повторов за запуск
+            sleep (Callable[[float], None]): функция ожидания
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.retries: Counter[int] = Counter()
+
+    @staticmethod
+    def is_retryable(error: APIError, idempotent: bool = True) -> bool:
+        if not idempotent:
+            return error.code == 429
+        return error.code in (408, 429) or error.code >= 500
+
+    def _take_from_budget(self, code: int) -> bool:
+        with self._lock:
+            if self.retries.total() >= self.budget:
+                return False
+            self.retries[code] += 1
+            return True
+
+    def _delay(self, attempt: int, error: APIError) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _can_retry(
+        self, error: APIError, attempt: int, delay: float, idempotent: bool
+    ) -> bool:
+        if not self.is_retryable(error, idempotent) or attempt >= self.max_attempts:
+            return False
+        if delay > self.max_delay:
+            logging.warning(
+                f"Google API просит повторить запрос через {delay:.1f} с, "
+                f"это больше максимальной задержки {self.max_delay} с."
+            )
+            return False
+        if not self._take_from_budget(error.code):
+            logging.warning("Исчерпан бюджет повторных запросов к Google API.")
+            return False
+        return True
+
+    def call(self, func: Callable[[], Any], idempotent: bool = True) -> Any:
+        """
+        Выполняет запрос, повторяя его при временных ошибках Google API.
+
+        Args:
+            func (Callable[[], Any]): отправка запроса
+            idempotent (bool): повтор запроса не меняет результат
+                (см. is_idempotent)
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except APIError as error:
+                attempt += 1
+                delay = self._delay(attempt, error)
+                if not self._can_retry(error, attempt, delay, idempotent):
+                    if error.code == 429:
+                        raise TooManyRequestsApiError(error) from error
+                    raise
+
+                logging.warning(
+                    f"Ошибка Google API {error.code}, повтор {attempt} "
+                    f"через {delay:.1f} с."
+                )
+                self._sleep(delay)
+
+    def summary(self) -> str:
+        """Возвращает сводку о повторах за запуск."""
+        by_code = ", ".join(
+            f"{code}: {count}" for code, count in sorted(self.retries.items())
+        )
+        return f"Повторных запросов к Google API: {self.retries.total()}" + (
+            f" ({by_code})" if by_code else ""
+        )
+
+    def reset(self) -> None:
+        """Сбрасывает счетчики и бюджет повторов перед новым запуском."""
+        with self._lock:
+            self.retries.clear()
@@ -0,0 +1,53 @@
+import threading
+from typing import Any, Dict, Tuple
+
+
+class SheetSnapshots:
+    """
+    Хранилище снимков данных, записанных на листы Google Sheets.
+
+    Снимок листа - словарь: номер строки -> хеш значений и форматирования
+    строки, а также ключ "merges" -> хеш объединений ячеек.
+    По снимку план записи определяет, какие строки изменились
+    с прошлого запуска. Снимки хранятся в памяти процесса и переживают
+    ежедневные запуски планировщика; после перезапуска процесса
+    первая запись на каждый лист будет полной.
+    """
+
+    def __init__(self):
+        """
+        self._snapshots: Dict[Tuple[str, int], Dict[Any, str]]
+            Ключ:
+                Tuple[str, int] - (spreadsheet_id, worksheet_id).
+            Значение:
+                Dict[Any, str] - снимок листа.
+
+        self._lock: threading.Lock
+            Блокировка изменения снимков: планы записи разных листов
+            отправляются одновременно из потоков пула.
+        """
+        self._snapshots: Dict[Tuple[str, int], Dict[Any, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Dict[Any, str] | None:
+        return self._snapshots.get(key)
+
+    def set(self, key: Tuple[str, int], snapshot: Dict[Any, str]) -> None:
+        with self._lock:
+            self._snapshots[key] = snapshot
+
+    def discard(self, key: Tuple[str, int]) -> None:
+        with self._lock:
+            self._snapshots.pop(key, None)
+
+    def discard_spreadsheet(self, spreadsheet_id: str) -> None:
+        """Удаляет снимки всех листов таблицы."""
+        with self._lock:
+            self._snapshots = {
+                key: value
+                for key, value in self._snapshots.items()
+                if key[0] != spreadsheet_id
+            }
+
+
+sheet_snapshots = SheetSnapshots()
@@ -1,6 +1,5 @@
-from datetime import datetime as dt
-
 import gspread
+import numpy as np
 from gspread.spreadsheet import Spreadsheet
 from gspread.worksheet import Worksheet
 from gspread_formatting import set_column_widths, set_frozen
@@ -11,6 +10,7 @@ from src.salary_bonus.config.environment import EMAILS
 from src.salary_bonus.exceptions import NonValidEmailsError
 from src.salary_bonus.logger import logging
 from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
+from src.salary_bonus.worksheets.write_plan import SheetWritePlan
 
 
 def get_column_letter(n: int) -> str:
@@ -25,47 +25,57 @@ def get_column_letter(n: int) -> str:
     return string
 
 
-def color_overdue_deadline(df: DataFrame, sheet: Worksheet, start_row: int = 2) -> None:
-    """Окрашивает ячейки с просроченным дедлайном."""
+def rows_to_ranges(rows: np.ndarray, column: str) -> list[str]:
+    """
+    Объединяет номера строк в диапазоны из подряд идущих строк.
+    Например, [3, 4, 5, 8] и "H" -> ["H3:H5", "H8"].
+    """
+    if len(rows) == 0:
+        return []
+
+    rows = np.sort(rows)
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    starts = rows[np.r_[0, breaks]]
+    ends = rows[np.r_[breaks - 1, len(rows) - 1]]
+
+    return [
+        f"{column}{start}" if start == end else f"{column}{start}:{column}{end}"
+        for start, end in zip(starts, ends)
+    ]
+
+
+def color_overdue_deadline(
+    df: DataFrame, sheet: Worksheet | SheetWritePlan, start_row: int = 2
+) -> None:
+    """
+    Окрашивает ячейки с просроченным дедлайном
+    (столбец "Дедлайн просрочен", см. check_deadlines).
+    """
     logging.info('Окраска ячеек в столбце "Дедлайн" с просроченным дедлайном.')
 
     last_row = start_row + len(df)
 
-    sheet.format(
-        f"H{start_row}:H{last_row}",
-        {
-            "backgroundColor": {"red": 1, "green": 1, "blue": 1},
-        },
+    overdue = df["Дедлайн просрочен"].to_numpy(dtype=bool)
+    overdue_rows = np.flatnonzero(overdue) + start_row
+
+    sheet.batch_format(
+        [
+            {
+                "range": f"H{start_row}:H{last_row}",
+                "format": {"backgroundColor": {"red": 1, "green": 1, "blue": 1}},
+            }
+        ]
+        + [
+            {
+                "range": range_name,
+                "format": {"backgroundColor": {"red": 1, "green": 0.8, "blue": 0.8}},
+            }
+            for range_name in rows_to_ranges(overdue_rows, "H")
+        ]
     )
-    for index, row in df.iterrows():
-        sheet_row = start_row + index
-        try:
-            end_date = dt.strptime(row["Дата окончания проекта"], "%d.%m.%Y").date()
-            deadline = dt.strptime(row["Дедлайн"], "%d.%m.%Y").date()
-
-            if deadline < end_date:
-                sheet.format(
-                    f"H{sheet_row}",
-                    {
-                        "backgroundColor": {"red": 1, "green": 0.8, "blue": 0.8},
-                    },
-                )
-        except ValueError:
-            try:
-                deadline = dt.strptime(row["Дедлайн"], "%d.%m.%Y").date()
-
-                if deadline < dt.now().date():
-                    sheet.format(
-                        f"H{sheet_row}",
-                        {
-                            "backgroundColor": {"red": 1, "green": 0.8, "blue": 0.8},
-                        },
-                    )
-            except ValueError:
-                continue
-
-
-def color_comp_correction(df: DataFrame, sheet: Worksheet) -> None:
+
+
+def color_comp_correction(df: DataFrame, sheet: Worksheet | SheetWritePlan) -> None:
     """Окрашивает ячейки с учтенной коррекцией сложности."""
     logging.info(
         "Окраска ячеек с учтенной коррекцией сложности "
@@ -73,25 +83,27 @@ def color_comp_correction(df: DataFrame, sheet: Worksheet) -> None:
     )
 
     last_row = len(df) + 1
-    sheet.format(
-        f"J2:J{last_row}",
+    formats = [
         {
-            "backgroundColor": {"red": 1, "green": 1, "blue": 1},
-        },
-    )
+            "range": f"J2:J{last_row}",
+            "format": {"backgroundColor": {"red": 1, "green": 1, "blue": 1}},
+        }
+    ]
     if "Корректировка сложности" in df.columns:
-        for index, row in df.iterrows():
-            if (
-                row["Корректировка сложности"]
-                and isinstance(row["Корректировка сложности"], str)
-                and row["Корректировка сложности"].isdigit()
-            ):
-                sheet.format(
-                    f"J{index + 2}",
-                    {
-                        "backgroundColor": {"red": 1, "green": 1, "blue": 0.8},
-                    },
-                )
+        # учтенная корректировка - строка из цифр, строка листа - по индексу df
+        values = df["Корректировка сложности"]
+        is_str = values.map(lambda value: isinstance(value, str)).astype(bool)
+        corrected = is_str & values.where(is_str, "").str.isdigit().astype(bool)
+        corrected_rows = df.index[corrected.to_numpy()].to_numpy(dtype=int) + 2
+        formats += [
+            {
+                "range": range_name,
+                "format": {"backgroundColor": {"red": 1, "green": 1, "blue": 0.8}},
+            }
+            for range_name in rows_to_ranges(corrected_rows, "J")
+        ]
+
+    sheet.batch_format(formats)
 
 
 def format_new_engineer_ws(sheet: Worksheet) -> None:
@@ -174,7 +186,4 @@ def format_bonus_spreadsheet(spreadsheet: Spreadsheet) -> None:
     sheets_manager.get_or_create_worksheet(
         spreadsheet=spreadsheet, title=SETTINGS_WS, rows=100, formatter=format_settings_ws
     )
-    sheet1 = spreadsheet.worksheet(FIRST_SHEET)
-    spreadsheet.del_worksheet(sheet1)
-
-    sheets_manager.invalidate_spreadsheet(spreadsheet)
+    sheets_manager.del_worksheet(spreadsheet, FIRST_SHEET)
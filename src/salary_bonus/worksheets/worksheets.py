@@ -1,11 +1,11 @@
-import gspread
 from gspread.spreadsheet import Spreadsheet
+from gspread.utils import absolute_range_name
 from gspread.worksheet import Worksheet
 from pandas.core.frame import DataFrame
 
+from src.salary_bonus.calculations.project_archive.counting_points import render_points
 from src.salary_bonus.config.defaults import (
     ADD_WORK_COL_NAMES,
-    AFTER_FORMAT_SLEEP,
     ARCHIVE_CURRENT_WS,
     BONUS_WS,
     CURRENT_YEAR,
@@ -13,7 +13,7 @@ from src.salary_bonus.config.defaults import (
     RESULT_WS,
     SETTINGS_WS,
 )
-from src.salary_bonus.config.environment import CREDS_PATH, ENDPOINT_ATTENDANCE_SHEET
+from src.salary_bonus.config.environment import ENDPOINT_ATTENDANCE_SHEET
 from src.salary_bonus.logger import logging
 from src.salary_bonus.worksheets.google_sheets_manager import sheets_manager
 from src.salary_bonus.worksheets.utils import (
@@ -25,8 +25,12 @@ from src.salary_bonus.worksheets.utils import (
     format_settings_ws,
     get_column_letter,
 )
+from src.salary_bonus.worksheets.write_plan import SheetWritePlan
 
-gc = gspread.service_account(filename=CREDS_PATH)
+gc = sheets_manager.client
+
+# планы записи на листы таблицы "Премирование", ключ - название листа
+write_plans: dict[str, SheetWritePlan] = {}
 
 
 def create_new_ws_archive(spreadsheet: Spreadsheet) -> Worksheet:
@@ -35,15 +39,17 @@ def create_new_ws_archive(spreadsheet: Spreadsheet) -> Worksheet:
     с таким же форматированием, как у листа прошлого года.
     """
     logging.info(f"Создание нового листа {CURRENT_YEAR} в таблице проектов.")
-    source_sheet = spreadsheet.worksheet(f"{int(CURRENT_YEAR) - 1}")
+    source_sheet = sheets_manager.get_worksheet(spreadsheet, f"{int(CURRENT_YEAR) - 1}")
     source_sheet_title = source_sheet.title
 
     destination_spreadsheet_id = spreadsheet.id
     source_sheet.copy_to(destination_spreadsheet_id)
+    sheets_manager.invalidate_worksheet(spreadsheet, f"{source_sheet_title} (копия)")
 
-    new_sheet = spreadsheet.worksheet(f"{source_sheet_title} (копия)")
+    new_sheet = sheets_manager.get_worksheet(spreadsheet, f"{source_sheet_title} (копия)")
 
     new_sheet.update_title(CURRENT_YEAR)
+    sheets_manager.invalidate_worksheet(spreadsheet, CURRENT_YEAR)
 
     total_rows = new_sheet.row_count
     total_cols = new_sheet.col_count
@@ -106,34 +112,114 @@ def connect_to_engineer_ws(
             spreadsheet,
             engineer,
             formatter=format_new_engineer_ws,
-            sleep_after=AFTER_FORMAT_SLEEP,
         )
 
     return engineer_ws
 
 
-def get_attendance_sheet_ws() -> list[Worksheet]:
-    """Подключается к табелю посещаемости офиса и возвращает все листы."""
+def batch_get_range(
+    spreadsheet: Spreadsheet, titles: list[str], range_name: str
+) -> dict[str, list[list[str]]]:
+    """
+    Читает диапазон range_name со всех указанных листов таблицы
+    одним запросом values_batch_get. Какие листы есть в таблице,
+    определяется по закешированным метаданным, листы, которых нет,
+    пропускаются.
+
+    Returns:
+        dict[str, list[list[str]]]: название листа -> значения диапазона
+    """
+    existing = {ws.title for ws in sheets_manager.get_all_worksheets(spreadsheet)}
+    titles = [title for title in titles if title in existing]
+    if not titles:
+        return {}
+
+    response = spreadsheet.values_batch_get(
+        [absolute_range_name(title, range_name) for title in titles]
+    )
+    return {
+        title: value_range.get("values", [])
+        for title, value_range in zip(titles, response["valueRanges"])
+    }
+
+
+def get_attendance_months_data(
+    titles: list[str], range_name: str = "A1:T160"
+) -> dict[str, list[list[str]]]:
+    """
+    Читает диапазон range_name со всех указанных листов табеля посещаемости
+    офиса одним запросом.
+    """
     spreadsheet: Spreadsheet = sheets_manager.get_spreadsheet_by_url(
         ENDPOINT_ATTENDANCE_SHEET
     )
-    worksheets = sheets_manager.get_all_worksheets(spreadsheet)
-    return worksheets
+    return batch_get_range(spreadsheet, titles, range_name)
+
+
+def get_engineers_ws_data(
+    engineers: list[str], range_name: str
+) -> dict[str, list[list[str]]]:
+    """
+    Читает диапазон range_name с листов проектировщиков таблицы
+    "Премирование" одним запросом. Новые листы не создаются.
+    """
+    spreadsheet: Spreadsheet = sheets_manager.get_or_create_spreadsheet(
+        BONUS_WS, format_bonus_spreadsheet
+    )
+    return batch_get_range(spreadsheet, engineers, range_name)
+
+
+def get_engineer_plan(engineer: str) -> SheetWritePlan:
+    """
+    Возвращает план записи на лист проектировщика.
+    Все данные проектировщика за запуск копятся в одном плане
+    и отправляются функцией flush_write_plans.
+    """
+    if engineer not in write_plans:
+        # листы проектировщиков готовятся в нескольких потоках,
+        # setdefault оставляет в словаре только один план листа
+        write_plans.setdefault(engineer, SheetWritePlan(connect_to_engineer_ws(engineer)))
+    return write_plans[engineer]
+
+
+def execute_write_plan(title: str) -> None:
+    """Отправляет план записи листа title и убирает его из write_plans."""
+    write_plans[title].execute()
+    del write_plans[title]
+
+
+async def flush_write_plans() -> None:
+    """
+    Отправляет все накопленные планы записи в таблицу "Премирование".
+    Планы разных листов отправляются одновременно, запросы проходят
+    через общий планировщик квот. На листы, записанные ранее, уходят
+    только изменившиеся строки.
+
+    Неотправленный план остается в write_plans, ошибка поднимается
+    после отправки остальных планов.
+    """
+    await sheets_manager.run_for_each(execute_write_plan, list(write_plans))
+
+
+def discard_write_plans() -> None:
+    """Сбрасывает неотправленные планы записи."""
+    write_plans.clear()
 
 
 def send_project_data_to_spreadsheet(df: DataFrame, engineer: str) -> None:
     """
-    Отправляет данные с баллами в таблицу "Премирование".
+    Добавляет данные с баллами в план записи листа проектировщика
+    в таблице "Премирование".
     """
-    logging.info("Отправка данных о проектах на лист проектировщика.")
-    sheet = connect_to_engineer_ws(engineer)
+    logging.info("Подготовка данных о проектах для листа проектировщика.")
+    plan = get_engineer_plan(engineer)
 
-    eng_small = df[ENG_WS_COL_NAMES]
+    eng_small = df[ENG_WS_COL_NAMES].assign(Баллы=render_points(df))
 
     # Очистка
-    sheet.batch_clear(["A2:I200"])
+    plan.batch_clear(["A2:I200"])
     # Удаление форматирования
-    sheet.format(
+    plan.format(
         "A2:I200",
         {
             "backgroundColor": {"red": 1, "green": 1, "blue": 1},
@@ -141,8 +227,8 @@ def send_project_data_to_spreadsheet(df: DataFrame, engineer: str) -> None:
         },
     )
     # Форматирование заголовка
-    sheet.update([["Корректировка сложности"]], "J1")
-    sheet.format(
+    plan.update([["Корректировка сложности"]], "J1")
+    plan.format(
         "A1:J1",
         {
             "backgroundColor": {"red": 0.7, "green": 1.0, "blue": 0.7},
@@ -150,31 +236,32 @@ def send_project_data_to_spreadsheet(df: DataFrame, engineer: str) -> None:
         },
     )
 
-    sheet.update([eng_small.columns.values.tolist()] + eng_small.values.tolist())
+    plan.update([eng_small.columns.values.tolist()] + eng_small.values.tolist())
 
-    color_overdue_deadline(eng_small, sheet)
-    color_comp_correction(df, sheet)
+    color_overdue_deadline(df, plan)
+    color_comp_correction(df, plan)
 
 
 def send_add_work_data_to_spreadsheet(
     df: DataFrame, engineer: str, archive_data: dict[str, DataFrame]
 ) -> None:
     """
-    Отправляет данные с баллами за доп. работы в таблицу "Премирование".
+    Добавляет данные с баллами за доп. работы в план записи листа
+    проектировщика в таблице "Премирование".
     """
-    logging.info("Отправка данных о доп. работах на лист проектировщика.")
-    sheet = connect_to_engineer_ws(engineer)
+    logging.info("Подготовка данных о доп. работах для листа проектировщика.")
+    plan = get_engineer_plan(engineer)
 
-    eng_small = df[ADD_WORK_COL_NAMES]
+    eng_small = df[ADD_WORK_COL_NAMES].assign(Баллы=render_points(df))
 
     if engineer in archive_data:
         main_projects_length = len(archive_data[engineer])
         start_row = main_projects_length + 4
-        sheet.update(
+        plan.update(
             [eng_small.columns.values.tolist()] + eng_small.values.tolist(),
             range_name=f"A{start_row}:H200",
         )
-        sheet.format(
+        plan.format(
             f"A{start_row}:H{start_row}",
             {
                 "backgroundColor": {"red": 1.0, "green": 0.85, "blue": 0.6},
@@ -183,76 +270,71 @@ def send_add_work_data_to_spreadsheet(
         )
         start_row += 1
     else:
-        sheet.format(
+        plan.format(
             "A1:H1",
             {
                 "backgroundColor": {"red": 1.0, "green": 0.85, "blue": 0.6},
                 "textFormat": {"bold": True},
             },
         )
-        sheet.format(
+        plan.format(
             "I1:J1",
             {
                 "backgroundColor": {"red": 1.0, "green": 1, "blue": 1},
                 "textFormat": {"bold": False},
             },
         )
-        sheet.batch_clear(["I1:J1"])
-        sheet.update([eng_small.columns.values.tolist()] + eng_small.values.tolist())
+        plan.batch_clear(["I1:J1"])
+        plan.update([eng_small.columns.values.tolist()] + eng_small.values.tolist())
         start_row = 2
 
-    color_overdue_deadline(eng_small, sheet, start_row)
+    color_overdue_deadline(df, plan, start_row)
 
 
 def send_month_data_to_spreadsheet(df: DataFrame, engineer: str) -> None:
     """
-    Отсылает данные о баллах, заработанных в каждом месяце
-    в таблицу "Премирование".
+    Добавляет данные о баллах, заработанных в каждом месяце,
+    в план записи листа проектировщика в таблице "Премирование".
     """
     logging.info(
-        f"Отправка данных о баллах по месяцам на лист проектировщика {engineer}."
+        f"Подготовка данных о баллах по месяцам для листа проектировщика {engineer}."
     )
-    sheet = connect_to_engineer_ws(engineer)
+    plan = get_engineer_plan(engineer)
 
-    sheet.update([df.columns.values.tolist()] + df.values.tolist(), range_name="L1:M13")
+    plan.update([df.columns.values.tolist()] + df.values.tolist(), range_name="L1:M13")
 
 
-def send_results_data_ws(df: DataFrame) -> None:
-    """Отправляет данные о средних баллах на лист "Итоги"."""
-    spreadsheet: Spreadsheet = sheets_manager.get_or_create_spreadsheet(
-        BONUS_WS, format_bonus_spreadsheet
-    )
+def get_result_plan() -> SheetWritePlan:
+    """
+    Возвращает план записи на лист "Итоги".
+    Отправляется функцией flush_write_plans вместе с планами проектировщиков.
+    """
+    if RESULT_WS not in write_plans:
+        spreadsheet: Spreadsheet = sheets_manager.get_or_create_spreadsheet(
+            BONUS_WS, format_bonus_spreadsheet
+        )
+        result_ws = sheets_manager.get_or_create_worksheet(
+            spreadsheet,
+            RESULT_WS,
+            cols=40,
+            formatter=format_new_result_ws,
+        )
+        write_plans[RESULT_WS] = SheetWritePlan(result_ws)
+    return write_plans[RESULT_WS]
 
-    result_ws = sheets_manager.get_or_create_worksheet(
-        spreadsheet,
-        RESULT_WS,
-        cols=40,
-        formatter=format_new_result_ws,
-        sleep_after=AFTER_FORMAT_SLEEP,
-    )
 
-    logging.info('Отправка данных о средних баллах на лист "Итоги".')
-    result_ws.update(
+def send_results_data_ws(df: DataFrame) -> None:
+    """Добавляет данные о средних баллах в план записи листа "Итоги"."""
+    logging.info('Подготовка данных о средних баллах для листа "Итоги".')
+    get_result_plan().update(
         [df.columns.values.tolist()] + df.values.tolist(), range_name="P1:Q15"
     )
 
 
 def send_hours_data_ws(df: DataFrame) -> None:
-    """Отправляет данные о рабочих часах на лист итогов."""
-    spreadsheet: Spreadsheet = sheets_manager.get_or_create_spreadsheet(
-        BONUS_WS, format_bonus_spreadsheet
-    )
-
-    result_ws = sheets_manager.get_or_create_worksheet(
-        spreadsheet,
-        RESULT_WS,
-        cols=40,
-        formatter=format_new_result_ws,
-        sleep_after=AFTER_FORMAT_SLEEP,
-    )
-
-    logging.info('Отправка данных о рабочих часах на лист "Итоги".')
-    result_ws.update(
+    """Добавляет данные о рабочих часах в план записи листа итогов."""
+    logging.info('Подготовка данных о рабочих часах для листа "Итоги".')
+    get_result_plan().update(
         [df.columns.values.tolist()] + df.values.tolist(), range_name="S1:AE30"
     )
 
@@ -260,16 +342,10 @@ def send_hours_data_ws(df: DataFrame) -> None:
 def send_lead_res_to_ws(
     leads_data: dict[str, DataFrame], gip_df: DataFrame | None
 ) -> None:
-    """Отправляет итоги руководителей группы на лист итогов."""
-    spreadsheet: Spreadsheet = sheets_manager.get_or_create_spreadsheet(
-        BONUS_WS, format_bonus_spreadsheet
-    )
-
-    ws: Worksheet = sheets_manager.get_or_create_worksheet(
-        spreadsheet, RESULT_WS, cols=40, formatter=format_new_result_ws
-    )
+    """Добавляет итоги руководителей группы в план записи листа итогов."""
+    ws = get_result_plan()
 
-    logging.info('Отправка данных по руководителям на лист "Итоги".')
+    logging.info('Подготовка данных по руководителям для листа "Итоги".')
 
     rows = []
     merge_rows: list[int] = []
@@ -0,0 +1,353 @@
+import hashlib
+import json
+from typing import Any
+
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+from gspread.worksheet import Worksheet
+
+from src.salary_bonus.logger import logging
+from src.salary_bonus.worksheets.snapshot import SheetSnapshots, sheet_snapshots
+
+GRID_KEYS = ("startRowIndex", "endRowIndex", "startColumnIndex", "endColumnIndex")
+
+
+class SheetWritePlan:
+    """
+    План записи на один лист Google Sheets.
+
+    Накапливает очистки, значения, форматирование и объединения ячеек
+    и отправляет их двумя запросами:
+        - spreadsheet.batch_update: очистки, форматы, объединения ячеек;
+        - spreadsheet.values_batch_update: значения.
+
+    Методы повторяют интерфейс gspread.Worksheet (batch_clear, update,
+    format, batch_format, merge_cells, unmerge_cells), поэтому план можно
+    передавать туда, где раньше использовался сам лист.
+    Очистки выполняются до записи значений.
+
+    Если для листа есть снимок прошлой записи, отправляются только
+    строки, значения или форматирование которых изменились.
+    """
+
+    def __init__(self, worksheet: Worksheet, snapshots: SheetSnapshots = sheet_snapshots):
+        """
+        Инициализация SheetWritePlan.
+
+        self.worksheet: Worksheet
+            Лист, на который будет произведена запись.
+
+        self._operations: list[tuple]
+            Операции в порядке добавления:
+                ("clear", grid_range)
+                ("values", grid_range, values)
+                ("format", grid_range, format)
+                ("merge" | "unmerge", grid_range)
+
+        self._snapshots: SheetSnapshots
+            Хранилище снимков записанных на листы данных.
+        """
+        self.worksheet: Worksheet = worksheet
+        self._operations: list[tuple] = []
+        self._snapshots = snapshots
+
+    def _grid_range(self, range_name: str) -> dict[str, int]:
+        return a1_range_to_grid_range(range_name, self.worksheet.id)
+
+    def batch_clear(self, ranges: list[str]) -> None:
+        """Очищает значения в диапазонах, не трогая форматирование."""
+        for range_name in ranges:
+            self._operations.append(("clear", self._grid_range(range_name)))
+
+    def update(self, values: list[list[Any]], range_name: str = "A1") -> None:
+        """Записывает значения, начиная с левой верхней ячейки диапазона."""
+        self._operations.append(("values", self._grid_range(range_name), values))
+
+    def format(self, ranges: str | list[str], format: dict[str, Any]) -> None:
+        """Форматирует один или несколько диапазонов."""
+        if isinstance(ranges, str):
+            ranges = [ranges]
+
+        self.batch_format(
+            [{"range": range_name, "format": format} for range_name in ranges]
+        )
+
+    def batch_format(self, formats: list[dict[str, Any]]) -> None:
+        """
+        Форматирует диапазоны.
+        Принимает список словарей вида {"range": str, "format": dict}.
+        """
+        for cell_format in formats:
+            self._operations.append(
+                ("format", self._grid_range(cell_format["range"]), cell_format["format"])
+            )
+
+    def merge_cells(self, range_name: str) -> None:
+        """Объединяет ячейки диапазона."""
+        self._operations.append(("merge", self._grid_range(range_name)))
+
+    def unmerge_cells(self, range_name: str) -> None:
+        """Разъединяет ячейки диапазона."""
+        self._operations.append(("unmerge", self._grid_range(range_name)))
+
+    def is_empty(self) -> bool:
+        return not self._operations
+
+    def _a1(self, first_row: int, first_col: int, last_row: int, last_col: int) -> str:
+        """Диапазон в A1-нотации по индексам с нуля (концы включительно)."""
+        return absolute_range_name(
+            self.worksheet.title,
+            f"{rowcol_to_a1(first_row + 1, first_col + 1)}:"
+            f"{rowcol_to_a1(last_row + 1, last_col + 1)}",
+        )
+
+    @staticmethod
+    def _repeat_cell(grid_range: dict[str, int], fmt: dict[str, Any]) -> dict:
+        return {
+            "repeatCell": {
+                "range": grid_range,
+                "cell": {"userEnteredFormat": fmt},
+                "fields": f"userEnteredFormat({','.join(fmt.keys())})",
+            }
+        }
+
+    def _full_requests(self) -> tuple[list[dict], list[dict]]:
+        """Запросы для полной записи всех накопленных операций."""
+        requests: list[dict] = []
+        values: list[dict] = []
+
+        for operation in self._operations:
+            kind, grid_range = operation[0], operation[1]
+            if kind == "clear":
+                requests.append(
+                    {"updateCells": {"range": grid_range, "fields": "userEnteredValue"}}
+                )
+            elif kind == "values":
+                start_row = grid_range.get("startRowIndex", 0)
+                start_col = grid_range.get("startColumnIndex", 0)
+                values.append(
+                    {
+                        "range": absolute_range_name(
+                            self.worksheet.title,
+                            rowcol_to_a1(start_row + 1, start_col + 1),
+                        ),
+                        "values": operation[2],
+                    }
+                )
+            elif kind == "format":
+                requests.append(self._repeat_cell(grid_range, operation[2]))
+            elif kind == "merge":
+                requests.append(
+                    {"mergeCells": {"mergeType": "MERGE_ALL", "range": grid_range}}
+                )
+            else:
+                requests.append({"unmergeCells": {"range": grid_range}})
+
+        return requests, values
+
+    def _is_bounded(self) -> bool:
+        return all(
+            operation[0] == "values" or all(key in operation[1] for key in GRID_KEYS)
+            for operation in self._operations
+        )
+
+    def _cell_state(self) -> dict[int, dict[int, list]]:
+        """
+        Итоговое состояние ячеек после применения всех операций:
+        номер строки -> номер столбца -> [значение, формат].
+        Значение None означает, что план не меняет значение ячейки.
+        """
+        state: dict[int, dict[int, list]] = {}
+
+        def cell(row: int, col: int) -> list:
+            return state.setdefault(row, {}).setdefault(col, [None, {}])
+
+        for operation in self._operations:
+            kind, grid_range = operation[0], operation[1]
+            if kind == "values":
+                start_row = grid_range.get("startRowIndex", 0)
+                start_col = grid_range.get("startColumnIndex", 0)
+                for row_offset, row_values in enumerate(operation[2]):
+                    for col_offset, value in enumerate(row_values):
+                        cell(start_row + row_offset, start_col + col_offset)[0] = value
+            elif kind in ("clear", "format"):
+                for row in range(grid_range["startRowIndex"], grid_range["endRowIndex"]):
+                    for col in range(
+                        grid_range["startColumnIndex"], grid_range["endColumnIndex"]
+                    ):
+                        if kind == "clear":
+                            cell(row, col)[0] = ""
+                        else:
+                            cell(row, col)[1] = {**cell(row, col)[1], **operation[2]}
+        return state
+
+    @staticmethod
+    def _hash(data: Any) -> str:
+        dump = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha1(dump.encode()).hexdigest()
+
+    def _snapshot(self, state: dict[int, dict[int, list]]) -> dict[Any, str]:
+        """
+        Снимок листа: хеш каждой строки и хеш объединений ячеек
+        (ключ "merges").
+        """
+        snapshot: dict[Any, str] = {
+            row: self._hash(sorted(cells.items())) for row, cells in state.items()
+        }
+        snapshot["merges"] = self._hash(
+            [op for op in self._operations if op[0] in ("merge", "unmerge")]
+        )
+        return snapshot
+
+    def _diff_requests(
+        self,
+        state: dict[int, dict[int, list]],
+        changed_rows: list[int],
+        merges_changed: bool,
+    ) -> tuple[list[dict], list[dict]]:
+        """Запросы для записи только изменившихся строк."""
+        requests: list[dict] = []
+        values: list[dict] = []
+
+        if merges_changed:
+            for operation in self._operations:
+                if operation[0] == "unmerge":
+                    requests.append({"unmergeCells": {"range": operation[1]}})
+                elif operation[0] == "merge":
+                    requests.append(
+                        {"mergeCells": {"mergeType": "MERGE_ALL", "range": operation[1]}}
+                    )
+
+        # смежные изменившиеся строки с одинаковыми отрезками
+        # объединяются в один диапазон
+        value_blocks: list[list] = []
+        format_blocks: list[list] = []
+
+        for row in changed_rows:
+            cells = state[row]
+            for first_col, last_col in _runs(
+                sorted(c for c in cells if cells[c][0] is not None)
+            ):
+                row_values = [cells[col][0] for col in range(first_col, last_col + 1)]
+                _extend_blocks(value_blocks, row, first_col, last_col, row_values)
+
+            formatted = sorted(col for col in cells if cells[col][1])
+            for first_col, last_col in _runs(
+                formatted, key=lambda col: self._hash(cells[col][1])
+            ):
+                _extend_blocks(
+                    format_blocks, row, first_col, last_col, cells[first_col][1]
+                )
+
+        for first_row, last_row, first_col, last_col, rows in value_blocks:
+            values.append(
+                {
+                    "range": self._a1(first_row, first_col, last_row, last_col),
+                    "values": rows,
+                }
+            )
+
+        for first_row, last_row, first_col, last_col, rows in format_blocks:
+            grid_range = {
+                "sheetId": self.worksheet.id,
+                "startRowIndex": first_row,
+                "endRowIndex": last_row + 1,
+                "startColumnIndex": first_col,
+                "endColumnIndex": last_col + 1,
+            }
+            requests.append(self._repeat_cell(grid_range, rows[0]))
+
+        return requests, values
+
+    def execute(self) -> None:
+        """
+        Отправляет накопленные изменения не более чем двумя запросами
+        и очищает план.
+        """
+        spreadsheet = self.worksheet.spreadsheet
+        key = (spreadsheet.id, self.worksheet.id)
+
+        snapshot = None
+        if self._is_bounded():
+            state = self._cell_state()
+            snapshot = self._snapshot(state)
+
+        previous = self._snapshots.get(key)
+        if snapshot is None or previous is None:
+            requests, values = self._full_requests()
+        else:
+            changed_rows = [row for row in state if previous.get(row) != snapshot[row]]
+            requests, values = self._diff_requests(
+                state, changed_rows, previous.get("merges") != snapshot["merges"]
+            )
+            logging.info(
+                f'Изменилось строк на листе "{self.worksheet.title}": '
+                f"{len(changed_rows)} из {len(state)}."
+            )
+
+        logging.info(
+            f'Запись на лист "{self.worksheet.title}": '
+            f"{len(requests)} запросов форматирования, "
+            f"{len(values)} диапазонов значений."
+        )
+
+        try:
+            if requests:
+                spreadsheet.batch_update({"requests": requests})
+            if values:
+                spreadsheet.values_batch_update(
+                    {"valueInputOption": "RAW", "data": values}
+                )
+        except Exception:
+            # часть запросов могла выполниться: содержимое листа неизвестно,
+            # поэтому следующая запись на лист будет полной
+            self._snapshots.discard(key)
+            raise
+
+        if snapshot is None:
+            self._snapshots.discard(key)
+        else:
+            self._snapshots.set(key, snapshot)
+
+        self._operations = []
+
+
+def _runs(cols: list[int], key=None) -> list[tuple[int, int]]:
+    """
+    Разбивает отсортированные номера столбцов на отрезки подряд идущих
+    столбцов (с одинаковым значением key, если он передан).
+    """
+    runs: list[tuple[int, int]] = []
+    for col in cols:
+        if (
+            runs
+            and runs[-1][1] == col - 1
+            and (key is None or key(runs[-1][1]) == key(col))
+        ):
+            runs[-1] = (runs[-1][0], col)
+        else:
+            runs.append((col, col))
+    return runs
+
+
+def _extend_blocks(
+    blocks: list[list], row: int, first_col: int, last_col: int, data: Any
+) -> None:
+    """
+    Добавляет отрезок строки к блоку из предыдущей строки, если отрезки
+    совпадают (для форматов - и формат тоже), иначе начинает новый блок.
+    Блок: [первая строка, последняя строка, первый столбец, последний столбец,
+    данные], где для значений данные - список строк, для форматов - [формат].
+    """
+    is_format = isinstance(data, dict)
+    for block in blocks:
+        if (
+            block[1] == row - 1
+            and block[2] == first_col
+            and block[3] == last_col
+            and (not is_format or block[4][0] == data)
+        ):
+            block[1] = row
+            if not is_format:
+                block[4].append(data)
+            return
+    blocks.append([row, row, first_col, last_col, [data]])
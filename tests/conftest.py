@@ -0,0 +1,7 @@
+from unittest import mock
+
+import gspread
+
+# клиент Google Sheets создается при импорте модулей листов,
+# тестам учетные данные сервисного аккаунта не нужны
+gspread.service_account = mock.MagicMock(name="service_account")
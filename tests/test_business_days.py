@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+
+import holidays
+import pandas as pd
+
+from src.salary_bonus.calculations.business_days import calculate_deadlines
+
+
+def reference_deadline(start: date, work_days: int) -> date:
+    """Построчный расчет дедлайна: перебор дней с праздниками РФ."""
+    ru_holidays = holidays.RU()
+    current, added = start, 0
+    while added < work_days:
+        if current.weekday() < 5 and current not in ru_holidays:
+            added += 1
+        current += timedelta(days=1)
+    return current - timedelta(days=1)
+
+
+def test_long_deadlines_account_for_holidays_of_later_years():
+    # дедлайн дальше запаса лет календаря после даты начала
+    start = date(2024, 1, 9)
+    work_days = [5, 600, 1500]
+
+    deadlines = calculate_deadlines(
+        pd.Series(pd.to_datetime([start] * len(work_days))), pd.Series(work_days)
+    )
+
+    assert [d.date() for d in deadlines] == [
+        reference_deadline(start, days) for days in work_days
+    ]
@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+from pandas.core.series import Series
+
+from src.salary_bonus.calculations.ingest import parse_project_archive
+from src.salary_bonus.calculations.project_archive.complexity import (
+    set_projects_complexity,
+)
+
+# Построчный расчет сложности до перехода на операции над столбцами.
+
+
+def count_sections(row: Series):
+    count = 0
+
+    ps = row["ПС"] == "Есть"
+    os = row["ОС"] == "Есть"
+    soue = row["СОУЭ"] == "Есть"
+    asv = row["Автоматизация систем вентиляции"] == "Есть"
+    characteristics = [ps, os, soue, asv]
+
+    for char in characteristics:
+        if char is True:
+            count += 1
+    return count
+
+
+def imperator(row: Series) -> bool:
+    if "Император" in row["Тип оборудования  пожаротушения (Заря/Император)"]:
+        return True
+    return False
+
+
+def count_types(row: Series) -> int:
+    module_types = row["Тип оборудования  пожаротушения (Заря/Император)"].split(",")
+    return len(module_types)
+
+
+def count_modules(row: Series) -> int:
+    modules = row["Количество модулей"].strip()
+    try:
+        count = int(modules)
+    except ValueError:
+        if "\n" in modules:
+            modules = modules.split("\n")
+            count = 0
+            for integer in modules:
+                count += int(integer.strip())
+            return count
+        if "+" in modules:
+            modules = modules.split("+")
+            count = 0
+            for integer in modules:
+                count += int(integer.strip())
+            return count
+        return None
+    return count
+
+
+def count_amount_directions_modules(row: Series) -> int:
+    amount_dirs = row["Количество направлений"].strip()
+    try:
+        amount_dirs = int(amount_dirs)
+    except ValueError:
+        amount_dirs = 0
+    count = count_modules(row)
+    if count:
+        count = count // 20
+        return count + amount_dirs
+    return amount_dirs
+
+
+def set_project_complexity(row: Series) -> int:  # noqa: C901
+    amount_sections = count_sections(row)
+
+    has_imperator = imperator(row)
+
+    amount_types = count_types(row)
+
+    amount_dirs = count_amount_directions_modules(row)
+
+    container_type = ["блок-контейнер", "контейнер"]
+    first_type = [
+        "школа",
+        "больница",
+        "поликлин",
+        "медицинские учреждения",
+        "мед. учрежд",
+        "цгс",
+        "отделение",
+        "комиссариат",
+        "гараж",
+    ]
+    second_type = ["адм. здание", "административное здание", "жк", "суд", "универ"]
+    third_type = [
+        "производственное здание",
+        "пром. предприятие",
+        "выставка",
+        "музей",
+        "нии",
+        "завод",
+        "модульная станция",
+        "станция",
+        "фок",
+    ]
+    fourth_type = ["цод", "производственное здание", "пром. предприятие"]
+
+    for type in container_type:
+        if type in row["Тип объекта"].strip().lower():
+            if has_imperator is True:
+                return 2
+            return 1
+    for type in first_type:
+        if type in row["Тип объекта"].strip().lower():
+            if amount_sections > 0 or has_imperator is True or amount_dirs >= 10:
+                return 2
+            return 1
+    for type in second_type:
+        if type in row["Тип объекта"].strip().lower():
+            if amount_dirs >= 18 or amount_sections > 0:
+                return 3
+            return 2
+    for type in third_type:
+        if type in row["Тип объекта"].strip().lower():
+            if amount_dirs >= 18 or (amount_dirs > 8 and has_imperator is True):
+                return 5
+            if amount_dirs > 8 or has_imperator is True:
+                return 4
+            return 3
+    for type in fourth_type:
+        if type in row["Тип объекта"].strip().lower():
+            if amount_dirs >= 20 or (amount_dirs >= 15 and amount_types > 1):
+                return 5
+            return 4
+
+    if amount_dirs <= 4:
+        return 2
+    if amount_dirs < 15:
+        return 3
+    if amount_dirs >= 20:
+        return 5
+    if amount_dirs >= 15 or amount_sections > 0 or has_imperator is True:
+        return 4
+    return 3
+
+
+OBJECT_TYPES = [
+    "блок-контейнер",
+    "Контейнер ",
+    " школа",
+    "Больница",
+    "поликлиника",
+    "медицинские учреждения",
+    "мед. учрежд.",
+    "ЦГС",
+    "отделение банка",
+    "военный комиссариат",
+    "гараж",
+    "адм. здание",
+    "административное здание",
+    "ЖК",
+    "суд",
+    "университет",
+    "производственное здание",
+    "пром. предприятие",
+    "выставка",
+    "музей",
+    "НИИ",
+    "завод",
+    "модульная станция",
+    "станция",
+    "ФОК",
+    "ЦОД",
+    "школа и завод",
+    "склад",
+    "",
+]
+SECTION_VALUES = ["Есть", "Нет", "", "есть"]
+EQUIPMENT = [
+    "Заря",
+    "Император",
+    "Заря, Император",
+    "Заря,Заря,Император",
+    "",
+    "император",
+]
+# пороговые значения дерева решений, пустые и некорректные значения
+DIRECTIONS = [
+    "0", "4", "5", "8", "9", "10", "14", "15", "17", "18", "19", "20", "25",
+    "", " 7 ", "abc", "2.5", "-3",
+]  # fmt: skip
+MODULES = [
+    "0", "19", "20", "39", "40", "100", "300", "10+15", "5\n30", " 21 ", "", "abc", "1,5",
+]  # fmt: skip
+
+
+def synthetic_archive(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    def pick(values: list[str]) -> list[str]:
+        return list(rng.choice(values, size=rows))
+
+    return pd.DataFrame(
+        {
+            "Страна": "Россия",
+            "Разработал": "Иванов",
+            "Тип объекта": pick(OBJECT_TYPES),
+            "ПС": pick(SECTION_VALUES),
+            "ОС": pick(SECTION_VALUES),
+            "СОУЭ": pick(SECTION_VALUES),
+            "Автоматизация систем вентиляции": pick(SECTION_VALUES),
+            "Сети": "",
+            "Объект культурного наследия": "",
+            "Является корректировкой": "",
+            "Тип оборудования  пожаротушения (Заря/Император)": pick(EQUIPMENT),
+            "Количество направлений": pick(DIRECTIONS),
+            "Количество модулей": pick(MODULES),
+            "СОТ (количество камер)": "",
+            "СКУД (количество точек доступа)": "",
+            "Продление дедлайна": "",
+            "Площадь защищаемых помещений (м^2)": "",
+            "Дата начала проекта": "",
+            "Дата окончания проекта": "",
+        }
+    )
+
+
+def test_complexity_matches_row_wise_reference():
+    df = synthetic_archive(20000, seed=9)
+    typed, _ = parse_project_archive(df)
+
+    expected = df.apply(set_project_complexity, axis=1)
+    result = set_projects_complexity(typed)
+
+    pd.testing.assert_series_equal(result, expected, check_dtype=False)
+    assert set(result.unique()) == {1, 2, 3, 4, 5}
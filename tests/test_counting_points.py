@@ -0,0 +1,136 @@
+import pandas as pd
+
+from src.salary_bonus.calculations.ingest import parse_project_archive
+from src.salary_bonus.calculations.partition import (
+    partition_by_engineer,
+    rows_by_engineer,
+)
+from src.salary_bonus.calculations.project_archive.counting_points import (
+    INVALID_DATA,
+    NOT_SUBMITTED,
+    count_points,
+    render_points,
+)
+
+ENGINEERS = ["Иванов", "Петров", "Сидоров"]
+
+
+def project(**values) -> dict[str, str]:
+    """Строка архива проектов: 2 направления, сложность 1, без разделов."""
+    row = {
+        "Страна": "Россия",
+        "Наименование объекта": "Объект",
+        "Шифр (ИСП)": "2024-03-01",
+        "Разработал": "Иванов",
+        "Тип объекта": "школа",
+        "Дата начала проекта": "01.03.2024",
+        "Дата окончания проекта": "04.03.2024",
+        "Является корректировкой": "Нет",
+        "Продление дедлайна": "",
+        "Количество направлений": "2",
+        "Площадь защищаемых помещений (м^2)": "100",
+        "ПС": "Нет",
+        "ОС": "Нет",
+        "СОУЭ": "Нет",
+        "Автоматизация систем вентиляции": "Нет",
+        "СОТ (количество камер)": "",
+        "СКУД (количество точек доступа)": "",
+        "Объект культурного наследия": "",
+        "Сети": "",
+        "Тип оборудования  пожаротушения (Заря/Император)": "Заря",
+        "Количество модулей": "",
+        "Сложность для расчета": 1,
+    }
+    row.update(values)
+    return row
+
+
+def score_by_engineer(rows: list[dict[str, str]]) -> pd.DataFrame:
+    """Баллы для всех пар проектировщик - проект, как в обработке архива."""
+    df = pd.DataFrame(rows)
+    engineer_rows = partition_by_engineer(df, ENGINEERS)
+    typed, errors = parse_project_archive(df)
+    typed = rows_by_engineer(typed, engineer_rows).reset_index(drop=True)
+    errors = rows_by_engineer(errors, engineer_rows).reset_index(drop=True)
+    typed["Дедлайн"] = ""
+    points = count_points(typed, errors, by="Проектировщик")
+    return points.assign(Проектировщик=typed["Проектировщик"].astype(str))
+
+
+def engineer_points(points: pd.DataFrame, engineer: str) -> list[float]:
+    return points.loc[points["Проектировщик"] == engineer, "Баллы"].tolist()
+
+
+def test_blocks_are_ranked_within_each_engineer_projects():
+    # контейнеры одного объекта с разными составами авторов:
+    # первый контейнер каждого проектировщика - полный балл, остальные - половина
+    block = {"Тип объекта": "блок-контейнер", "Наименование объекта": "Объект 1"}
+    rows = [
+        project(**block, Разработал="Иванов", **{"Дата начала проекта": "01.03.2024"}),
+        project(
+            **block, Разработал="Иванов, Петров", **{"Дата начала проекта": "02.03.2024"}
+        ),
+        project(
+            **block, Разработал="Иванов, Сидоров", **{"Дата начала проекта": "03.03.2024"}
+        ),
+        project(
+            **block, Разработал="Петров, Сидоров", **{"Дата начала проекта": "04.03.2024"}
+        ),
+    ]
+
+    points = score_by_engineer(rows)
+
+    assert engineer_points(points, "Иванов") == [1.0, 0.25, 0.25]
+    assert engineer_points(points, "Петров") == [0.5, 0.25]
+    assert engineer_points(points, "Сидоров") == [0.5, 0.25]
+
+
+def test_blocks_without_code_keep_own_deadlines():
+    # блок-контейнеры считаются и без шифра, но не объединяются в один проект
+    rows = [
+        project(**{"Тип объекта": "блок-контейнер", "Шифр (ИСП)": ""}),
+        project(
+            **{
+                "Тип объекта": "блок-контейнер",
+                "Шифр (ИСП)": "",
+                "Наименование объекта": "Объект 2",
+                "Дата начала проекта": "11.03.2024",
+            }
+        ),
+        project(**{"Дата начала проекта": "20.03.2024"}),
+        project(**{"Дата начала проекта": "25.03.2024"}),
+    ]
+
+    deadlines = score_by_engineer(rows)["Дедлайн"].tolist()
+
+    assert deadlines[0] != deadlines[1]
+    assert deadlines[2] == deadlines[3]
+
+
+def test_unscorable_projects_get_invalid_data_status():
+    rows = [
+        project(**{"Сложность для расчета": "abc"}),
+        project(**{"Сложность для расчета": 7}),
+        # площадь больше максимальной в таблице при наличии разделов
+        project(**{"Площадь защищаемых помещений (м^2)": "200000", "ПС": "Есть"}),
+        # без разделов площадь не влияет на баллы
+        project(**{"Площадь защищаемых помещений (м^2)": "200000"}),
+    ]
+
+    points = score_by_engineer(rows)
+
+    assert points["Статус баллов"].tolist()[:3] == [INVALID_DATA] * 3
+    assert points["Баллы"][:3].isna().all()
+    assert pd.isna(points["Статус баллов"][3])
+    assert points["Баллы"][3] == 1.0
+
+
+def test_whole_points_are_rendered_without_fraction():
+    points = pd.DataFrame(
+        {
+            "Баллы": [2.0, 1.5, 3.0, float("nan")],
+            "Статус баллов": [None, None, NOT_SUBMITTED, INVALID_DATA],
+        }
+    )
+
+    assert render_points(points).tolist() == [2, 1.5, f"3{NOT_SUBMITTED}", INVALID_DATA]
@@ -0,0 +1,92 @@
+import pytest
+
+from src.salary_bonus.worksheets.rate_limiter import RequestScheduler, TokenBucket
+
+
+class FakeClock:
+    """Часы, время которых идет только во время ожидания."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def admission_times(acquire, clock: FakeClock, calls: int) -> list[float]:
+    """Моменты, в которые запросы были пропущены."""
+    times = []
+    for _ in range(calls):
+        acquire()
+        times.append(clock.now)
+    return times
+
+
+def max_calls_per_window(times: list[float], window: float) -> int:
+    return max(
+        sum(1 for t in times if start <= t < start + window - 1e-9) for start in times
+    )
+
+
+def test_bucket_admits_burst_without_waiting():
+    clock = FakeClock()
+    bucket = TokenBucket(5, 1.0, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0] * 5
+    assert clock.now == 0.0
+
+
+def test_bucket_admits_calls_at_refill_rate_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(5, 2.0, clock=clock, sleep=clock.sleep)
+
+    times = admission_times(bucket.acquire, clock, 15)
+
+    assert times[:5] == [0.0] * 5
+    assert [b - a for a, b in zip(times[5:], times[6:])] == pytest.approx([0.5] * 9)
+    assert times[-1] == pytest.approx(10 / 2.0)
+
+
+def test_bucket_refill_is_capped_by_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(3, 1.0, clock=clock, sleep=clock.sleep)
+    admission_times(bucket.acquire, clock, 3)
+
+    clock.now += 100
+    start = clock.now
+    times = admission_times(bucket.acquire, clock, 5)
+
+    assert times[:3] == [start] * 3
+    assert times[3:] == pytest.approx([start + 1, start + 2])
+
+
+@pytest.mark.parametrize("method, quota", [("GET", 60), ("POST", 30)])
+def test_scheduler_keeps_each_quota_per_minute(method, quota):
+    clock = FakeClock()
+    scheduler = RequestScheduler(60, 30, 10, clock=clock, sleep=clock.sleep)
+
+    times = admission_times(lambda: scheduler.acquire(method), clock, 3 * quota)
+
+    assert max_calls_per_window(times, 60) <= quota
+    # после всплеска запросы идут со скоростью (квота - burst) в минуту
+    steady = times[10:]
+    assert [b - a for a, b in zip(steady, steady[1:])] == pytest.approx(
+        [60 / (quota - 10)] * (len(steady) - 1)
+    )
+    assert scheduler.waited == pytest.approx(times[-1])
+
+
+def test_scheduler_reads_do_not_use_write_quota():
+    clock = FakeClock()
+    scheduler = RequestScheduler(60, 30, 10, clock=clock, sleep=clock.sleep)
+
+    admission_times(lambda: scheduler.acquire("get"), clock, 10)
+    writes = admission_times(lambda: scheduler.acquire("PUT"), clock, 10)
+
+    assert writes == [0.0] * 10
+    assert scheduler.waited == 0.0
@@ -0,0 +1,103 @@
+import pytest
+from gspread.exceptions import APIError
+
+from src.salary_bonus.exceptions import TooManyRequestsApiError
+from src.salary_bonus.worksheets.retry import RetryPolicy, is_idempotent
+
+
+class FakeResponse:
+    """Ответ Google API с ошибкой."""
+
+    def __init__(self, code: int, headers: dict[str, str] | None = None):
+        self.code = code
+        self.headers = headers or {}
+
+    def json(self) -> dict:
+        return {"error": {"code": self.code, "message": "error", "status": "ERROR"}}
+
+
+def failing(*responses: FakeResponse):
+    """Запрос, который завершается ошибками responses, а затем успешно."""
+    calls = []
+
+    def send():
+        calls.append(len(calls))
+        if len(calls) <= len(responses):
+            raise APIError(responses[len(calls) - 1])
+        return "ok"
+
+    return send, calls
+
+
+def make_policy(delays: list[float]) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=5, base_delay=1, max_delay=30, budget=10, sleep=delays.append
+    )
+
+
+def test_retry_after_is_honoured():
+    delays = []
+    send, calls = failing(FakeResponse(429, {"Retry-After": "20"}))
+
+    assert make_policy(delays).call(send) == "ok"
+    assert delays == [20.0]
+    assert len(calls) == 2
+
+
+def test_retry_after_above_max_delay_stops_retries():
+    delays = []
+    send, calls = failing(FakeResponse(429, {"Retry-After": "120"}))
+
+    with pytest.raises(TooManyRequestsApiError):
+        make_policy(delays).call(send)
+    assert delays == []
+    assert len(calls) == 1
+
+
+def test_non_idempotent_requests_are_retried_only_after_429():
+    delays = []
+    policy = make_policy(delays)
+
+    send, calls = failing(FakeResponse(503))
+    with pytest.raises(APIError):
+        policy.call(send, idempotent=False)
+    assert len(calls) == 1
+
+    send, calls = failing(FakeResponse(429))
+    assert policy.call(send, idempotent=False) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "method, endpoint, json, expected",
+    [
+        ("get", "https://sheets.googleapis.com/v4/spreadsheets/id", None, True),
+        (
+            "post",
+            "https://sheets.googleapis.com/v4/spreadsheets/id/values:batchUpdate",
+            {},
+            True,
+        ),
+        (
+            "post",
+            "https://sheets.googleapis.com/v4/spreadsheets/id:batchUpdate",
+            {"requests": [{"repeatCell": {}}, {"mergeCells": {}}]},
+            True,
+        ),
+        (
+            "post",
+            "https://sheets.googleapis.com/v4/spreadsheets/id:batchUpdate",
+            {"requests": [{"addSheet": {}}]},
+            False,
+        ),
+        (
+            "post",
+            "https://sheets.googleapis.com/v4/spreadsheets/id/sheets/0:copyTo",
+            {},
+            False,
+        ),
+        ("post", "https://www.googleapis.com/drive/v3/files", {}, False),
+    ],
+)
+def test_is_idempotent(method, endpoint, json, expected):
+    assert is_idempotent(method, endpoint, json) is expected
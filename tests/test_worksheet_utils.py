@@ -0,0 +1,36 @@
+import pandas as pd
+
+from src.salary_bonus.worksheets.utils import color_comp_correction
+
+CORRECTED = {"red": 1, "green": 1, "blue": 0.8}
+
+
+class FakeSheet:
+    """Лист, запоминающий запросы форматирования."""
+
+    def __init__(self):
+        self.formats = []
+
+    def batch_format(self, formats: list[dict]) -> None:
+        self.formats += formats
+
+
+def colored_ranges(sheet: FakeSheet, color: dict) -> list[str]:
+    return [
+        item["range"]
+        for item in sheet.formats
+        if item["format"]["backgroundColor"] == color
+    ]
+
+
+def test_comp_correction_colors_digit_strings_by_df_index():
+    df = pd.DataFrame(
+        {"Корректировка сложности": ["3", 4, None, "", "abc", "5"]},
+        index=[10, 11, 12, 13, 14, 15],
+    )
+    sheet = FakeSheet()
+
+    color_comp_correction(df, sheet)
+
+    assert sheet.formats[0]["range"] == "J2:J7"
+    assert colored_ranges(sheet, CORRECTED) == ["J12", "J17"]